@@ -0,0 +1,42 @@
+"""Add users (created_at, id) index for keyset pagination
+
+Revision ID: b4e1c7d2a9f3
+Revises: 60849fbcf0e8
+Create Date: 2026-10-17 10:12:41.218530
+
+The index is built with CREATE INDEX CONCURRENTLY in an autocommit block,
+so writes to users continue while it builds. A failed build leaves an
+INVALID index behind; drop it and upgrade again.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e1c7d2a9f3'
+down_revision: Union[str, Sequence[str], None] = '60849fbcf0e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_created_at_id',
+            'users',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_created_at_id', table_name='users', postgresql_concurrently=True
+        )
@@ -0,0 +1,47 @@
+"""Add unique index on lower(email)
+
+Revision ID: e5b19c3f7a42
+Revises: d2f8a0b6c913
+Create Date: 2026-10-17 19:02:37.604118
+
+The index is built with CREATE INDEX CONCURRENTLY, which cannot run
+inside a transaction, so it runs in an autocommit block and does not
+block writes to users while it builds. If the build fails (for example
+on two emails that differ only in case) PostgreSQL leaves an INVALID
+index behind; IF NOT EXISTS is not used so the rerun fails loudly
+instead of keeping it. Drop it, fix the rows and upgrade again.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19c3f7a42'
+down_revision: Union[str, Sequence[str], None] = 'd2f8a0b6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Emails are stored lowercased; fix any rows written before that was enforced
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ux_users_email_lower', table_name='users', postgresql_concurrently=True
+        )
@@ -0,0 +1,71 @@
+"""Scope user email index to live rows and index soft-deleted rows
+
+Revision ID: f3c8d1a2b7e5
+Revises: e5b19c3f7a42
+Create Date: 2026-10-17 21:15:48.402913
+
+The unique lower(email) index becomes partial (WHERE is_deleted = false),
+so a soft-deleted user no longer blocks the email from being registered
+again, and the full unique index on email is dropped. A partial index on
+deleted_at (WHERE is_deleted = true) serves the purge job.
+
+Every index is built or dropped CONCURRENTLY in an autocommit block so
+writes to users continue meanwhile. The new email index is built under a
+temporary name and renamed once the old one is gone, so email lookups
+always have an index to use.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8d1a2b7e5'
+down_revision: Union[str, Sequence[str], None] = 'e5b19c3f7a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_users_email_lower_live',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ux_users_email_lower', table_name='users', postgresql_concurrently=True)
+        op.execute('ALTER INDEX ux_users_email_lower_live RENAME TO ux_users_email_lower')
+        op.drop_index(op.f('ix_users_email'), table_name='users', postgresql_concurrently=True)
+        op.create_index(
+            'ix_users_deleted_at',
+            'users',
+            ['deleted_at'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = true'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails if a deleted and a live user share an email; purge first
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_deleted_at', table_name='users', postgresql_concurrently=True)
+        op.create_index(
+            op.f('ix_users_email'), 'users', ['email'], unique=True, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ux_users_email_lower_all',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ux_users_email_lower', table_name='users', postgresql_concurrently=True)
+        op.execute('ALTER INDEX ux_users_email_lower_all RENAME TO ux_users_email_lower')
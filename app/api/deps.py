@@ -3,11 +3,13 @@
 
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
-from app.db.session import get_db
+from app.core.principal_cache import principal_cache, UserSnapshot
+from app.db.session import get_read_db
 from app.services.auth_service import AuthService
+from app.services.token_service import decode_access_token
 from app.models.user import User
 from app.core.exceptions import AuthenticationError, UserNotFoundError
 from app.schemas.token import TokenPayload
@@ -18,13 +20,15 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> User:
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_read_db)
+) -> UserSnapshot:
     """Get current authenticated user"""
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise AuthenticationError("Could not validate credentials")
@@ -35,16 +39,18 @@ async def get_current_user(
 
     
     # Direct fetch is better here to avoid password check logic
-    user = await User.fetch_unique(db, email=token_data.sub)
+    user = await User.fetch_by_email(db, token_data.sub)
     if user is None:
         raise UserNotFoundError("User not found")
-        
-    return user
+
+    snapshot = UserSnapshot.from_user(user)
+    principal_cache.set(token, payload, snapshot)
+    return snapshot
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
     """Check if user is active"""
     if not current_user.is_active:
         raise AuthenticationError("Inactive user")
@@ -54,8 +60,8 @@ async def get_current_active_user(
 def get_current_user_with_role(role: str):
     """Factory to check for specific role"""
     async def _get_user_with_role(
-        current_user: User = Depends(get_current_active_user)
-    ) -> User:
+        current_user: UserSnapshot = Depends(get_current_active_user)
+    ) -> UserSnapshot:
         if current_user.role != role and current_user.role != "admin": # Admin can always access
              # Simple RBAC: Exact match or admin overrides
             raise AuthenticationError("Not enough permissions")
@@ -1,26 +1,33 @@
-from fastapi import APIRouter, Depends, status, BackgroundTasks
+from fastapi import APIRouter, Depends, Request, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
 from app.db.session import get_db
 from app.services.auth_service import AuthService
 from app.services.token_service import create_verification_token, create_access_token
+from app.services.refresh_token_service import RefreshTokenService
 from app.services.email_service import EmailService
 from app.utils.logger import logger
+from app.core.config import get_settings
 from app.core.exceptions import (
     UserAlreadyExistsError,
     RegistrationError,
     InvalidTokenError,
     UserNotFoundError,
-    AuthenticationError
+    AuthenticationError,
+    RateLimitExceededError
 )
 from app.schemas.user import UserRegistrationRequest, UserRegistrationResponse, UserLoginRequest
-from app.schemas.token import Token
+from app.schemas.token import Token, RefreshTokenRequest
 from app.api.deps import get_current_user, get_current_active_user, get_current_user_with_role
 from app.models.user import User
+from app.core.principal_cache import UserSnapshot
+from app.core.rate_limit import client_ip, login_limiter
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.utils.responses import fail_response, success_response
+from app.utils.responses import auth_response, fail_response, rate_limited_response, success_response
 
 
 
+settings = get_settings()
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
@@ -29,7 +36,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
     summary="Get Current User",
     response_description="Current user profile",
 )
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: UserSnapshot = Depends(get_current_active_user)):
     """Get current user"""
     user_response = UserRegistrationResponse(
         id=str(current_user.id),
@@ -42,7 +49,7 @@ async def read_users_me(current_user: User = Depends(get_current_active_user)):
     return success_response(
         status_code=status.HTTP_200_OK,
         message="User profile retrieved",
-        data=user_response.model_dump(),
+        data=user_response,
     )
 
 
@@ -68,12 +75,13 @@ async def register(
     try:
         user = await AuthService.register_user(db, user_data)
         
-        # Schedule email verification
-        try:
-            token = create_verification_token(user.email)
-            background_tasks.add_task(EmailService.send_verification_email, user, token)
-        except Exception as e:
-            logger.error(f"Failed to schedule verification email: {e}")
+        # With the outbox, the email was queued alongside the user row
+        if settings.EMAIL_DELIVERY_MODE == "background":
+            try:
+                token = create_verification_token(user.email)
+                background_tasks.add_task(EmailService.send_verification_email, user, token)
+            except Exception as e:
+                logger.error(f"Failed to schedule verification email: {e}")
 
         user_response = UserRegistrationResponse(
             id=str(user.id),
@@ -88,7 +96,7 @@ async def register(
         return success_response(
             status_code=status.HTTP_201_CREATED,
             message="Welcome to Hotspot! Your account has been created successfully.",
-            data=user_response.model_dump(),
+            data=user_response,
         )
 
     except UserAlreadyExistsError as e:
@@ -142,14 +150,20 @@ async def verify_email(token: str, db: AsyncSession = Depends(get_db)):
     description="Login using form data (username/password). Used by Swagger UI."
 )
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
     """OAuth2 compatible token login"""
     try:
+        await login_limiter.check(client_ip(request), form_data.username)
         user = await AuthService.authenticate_user(db, form_data.username, form_data.password)
+        await login_limiter.reset_email(form_data.username)
         access_token = create_access_token(data={"sub": user.email})
-        return {"access_token": access_token, "token_type": "bearer"}
+        refresh_token = await RefreshTokenService.issue(db, user)
+        return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+    except RateLimitExceededError as e:
+        return rate_limited_response(e)
     except AuthenticationError as e:
         # OAuth2 requires 400 Bad Request for invalid credentials usually, or 401
         # FastAPI security expects specific exception for headers usually, but returning dict works if model matches.
@@ -170,23 +184,62 @@ async def login_for_access_token(
     response_description="Login response with token",
 )
 async def login(
+    request: Request,
     login_data: UserLoginRequest,
     db: AsyncSession = Depends(get_db)
 ):
     """JSON Login"""
     try:
+        await login_limiter.check(client_ip(request), login_data.email)
         user = await AuthService.authenticate_user(db, login_data.email, login_data.password)
+        await login_limiter.reset_email(login_data.email)
         access_token = create_access_token(data={"sub": user.email})
-        
-        token_data = {"access_token": access_token, "token_type": "bearer"}
-        
-        return success_response(
+        refresh_token = await RefreshTokenService.issue(db, user)
+
+        return auth_response(
             status_code=status.HTTP_200_OK,
             message="Login successful",
-            data=token_data
+            access_token=access_token,
+            refresh_token=refresh_token,
+            data={"token_type": "bearer"},
         )
+    except RateLimitExceededError as e:
+        return rate_limited_response(e)
     except AuthenticationError as e:
         return fail_response(status_code=status.HTTP_401_UNAUTHORIZED, message=str(e))
     except Exception as e:
         logger.error(f"Login error: {e}")
         return fail_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, message="Login failed")
+
+
+@router.post(
+    "/refresh",
+    status_code=status.HTTP_200_OK,
+    summary="Refresh Access Token",
+    response_description="New access and refresh tokens",
+    responses={
+        200: {"description": "Tokens rotated"},
+        401: {"description": "Invalid, expired or revoked refresh token"},
+    },
+)
+async def refresh(
+    refresh_data: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Exchange a refresh token for a new token pair"""
+    try:
+        _, access_token, refresh_token = await RefreshTokenService.rotate(
+            db, refresh_data.refresh_token
+        )
+        return auth_response(
+            status_code=status.HTTP_200_OK,
+            message="Token refreshed",
+            access_token=access_token,
+            refresh_token=refresh_token,
+            data={"token_type": "bearer"},
+        )
+    except InvalidTokenError as e:
+        return fail_response(status_code=status.HTTP_401_UNAUTHORIZED, message=str(e))
+    except Exception as e:
+        logger.error(f"Refresh error: {e}")
+        return fail_response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, message="Token refresh failed")
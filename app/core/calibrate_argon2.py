@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""
+Propose Argon2 parameters for this host.
+
+For each memory cost from --max-memory-mib down, measures one pass and
+picks the largest time cost that keeps a verify under --target-ms. The
+first (most memory-hard) setting that allows at least --min-time-cost
+passes wins. Run it on the hardware the API is deployed to:
+
+    python -m app.core.calibrate_argon2 --target-ms 250
+
+and copy the printed ARGON2_* lines into .env. Existing hashes are
+upgraded on each user's next login.
+"""
+
+import argparse
+import statistics
+import time
+from app.core.config import get_settings
+from app.core.security import build_pwd_context
+
+settings = get_settings()
+
+SAMPLE_PASSWORD = "calibration-Password-123!"
+
+
+def measure_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    """Median verify latency in milliseconds for the given parameters"""
+    context = build_pwd_context(time_cost, memory_cost, parallelism)
+    hash = context.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hash)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float,
+    parallelism: int,
+    max_memory_mib: int,
+    min_memory_mib: int = 19,
+    min_time_cost: int = 2,
+    samples: int = 3,
+) -> tuple[int, int, int, float]:
+    """Return (time_cost, memory_cost KiB, parallelism, measured ms)"""
+    candidates = []
+    memory_mib = max_memory_mib
+    while memory_mib > min_memory_mib:
+        candidates.append(memory_mib)
+        memory_mib //= 2
+    candidates.append(min_memory_mib)
+
+    for memory_mib in candidates:
+        memory_cost = memory_mib * 1024
+        single_pass = measure_ms(1, memory_cost, parallelism, samples)
+        time_cost = int(target_ms // single_pass)
+        if time_cost >= min_time_cost or memory_mib == min_memory_mib:
+            time_cost = max(time_cost, min_time_cost)
+            measured = measure_ms(time_cost, memory_cost, parallelism, samples)
+            # Cost is not perfectly linear in passes; step back if we overshot
+            while measured > target_ms and time_cost > min_time_cost:
+                time_cost -= 1
+                measured = measure_ms(time_cost, memory_cost, parallelism, samples)
+            return time_cost, memory_cost, parallelism, measured
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="verify latency budget")
+    parser.add_argument("--parallelism", type=int, default=settings.ARGON2_PARALLELISM)
+    parser.add_argument("--max-memory-mib", type=int, default=256)
+    parser.add_argument("--min-time-cost", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    current = measure_ms(
+        settings.ARGON2_TIME_COST,
+        settings.ARGON2_MEMORY_COST,
+        settings.ARGON2_PARALLELISM,
+        args.samples,
+    )
+    print(
+        f"current: t={settings.ARGON2_TIME_COST} m={settings.ARGON2_MEMORY_COST} "
+        f"p={settings.ARGON2_PARALLELISM} -> {current:.1f} ms"
+    )
+
+    time_cost, memory_cost, parallelism, measured = calibrate(
+        args.target_ms,
+        args.parallelism,
+        args.max_memory_mib,
+        min_time_cost=args.min_time_cost,
+        samples=args.samples,
+    )
+    logins_per_second = settings.PASSWORD_HASH_WORKERS * 1000 / measured
+    print(
+        f"proposed: t={time_cost} m={memory_cost} p={parallelism} -> {measured:.1f} ms "
+        f"(~{logins_per_second:.0f} logins/s with {settings.PASSWORD_HASH_WORKERS} hash workers)"
+    )
+    print()
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={parallelism}")
+
+
+if __name__ == "__main__":
+    main()
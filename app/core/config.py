@@ -13,10 +13,47 @@ class Settings(BaseSettings):
     APP_NAME: str = "Hotspot Management"
     DEBUG: bool = False
     LOG_LEVEL: str
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    METRICS_ENABLED: bool = False
+    SLOW_REQUEST_MS: int = 1000
+    GZIP_MINIMUM_SIZE: int = 0
+    MIDDLEWARE_SKIP_PATHS: dict[str, list[str]] = {}
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 75
+    SERVER_LIMIT_CONCURRENCY: int = 1000
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_MAX_REQUESTS_JITTER: int = 0
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SHUTDOWN_DRAIN_SECONDS: float = 10.0
 
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
+    POSTGRES_SERVER: str = "localhost"
+    POSTGRES_PORT: int = 5432
+
+    SQL_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_MIN_CONNECTIONS: int = 2
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMENT_REQUEST_ID: bool = False
+    DB_REPLICA_URLS: list[str] = []
+    DB_BULK_CHUNK_SIZE: int = 1000
+    SOFT_DELETE_RETENTION_DAYS: int = 30
+    PURGE_BATCH_SIZE: int = 500
+    PURGE_BATCH_PAUSE_SECONDS: float = 0.1
+
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 500
 
     BASE_URI: str = "http://localhost:8000"
 
@@ -30,11 +67,52 @@ class Settings(BaseSettings):
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
     SUPPRESS_SEND: int = 0
+    MAIL_POOL_SIZE: int = 4
+    MAIL_MAX_PENDING: int = 1000
+    MAIL_KEEPALIVE_SECONDS: float = 30.0
+
+    EMAIL_DELIVERY_MODE: str = "outbox"
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 1.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = 30
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: int = 3600
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 300
+    EMAIL_OUTBOX_REPORT_SECONDS: float = 60.0
 
     SECRET_KEY: str
     SECURITY_SALT: str
     ALGORITHM: str
+    JWT_KEYS_DIR: str = "keys"
+    JWT_ACTIVE_KID: str = ""
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE_URL: str = ""
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+
+    @property
+    def DATABASE_URL(self) -> str:
+        """Async SQLAlchemy URL for the primary database"""
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
 
     model_config = SettingsConfigDict(
         env_file=".env",
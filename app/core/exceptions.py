@@ -36,3 +36,16 @@ class AuthenticationError(BaseAuthException):
     def __init__(self, message="Incorrect email or password"):
         self.message = message
         super().__init__(self.message)
+
+class RateLimitExceededError(BaseAuthException):
+    """Raised when too many login attempts were made"""
+    def __init__(self, message="Too many login attempts, please try again later", retry_after=60):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded"""
+    def __init__(self, message="Invalid pagination cursor"):
+        self.message = message
+        super().__init__(self.message)
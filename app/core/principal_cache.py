@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""
+Verified-token cache for authenticated requests.
+
+Maps a digest of an access token to its decoded claims and a compact snapshot
+of the user it belongs to, so repeat requests with the same token skip both
+`jwt.decode` and the user lookup. Entries never outlive the token's `exp`.
+Invalidation is per process; the TTL bounds how long another worker may keep
+serving a stale snapshot.
+"""
+
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Immutable view of the user fields needed to authorize a request"""
+
+    id: uuid.UUID
+    email: str
+    full_name: str
+    role: str
+    is_active: bool
+    email_verified: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=user.is_active,
+            email_verified=user.email_verified,
+            created_at=user.created_at,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    expires_at: float
+    claims: dict
+    user: UserSnapshot
+
+
+class PrincipalCache:
+    """TTL + LRU cache of verified tokens keyed by token digest"""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._by_user: dict[uuid.UUID, set[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> tuple[dict, UserSnapshot] | None:
+        """Return cached (claims, user) for a token, or None"""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= self._clock():
+            self._discard(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.claims, entry.user
+
+    def set(self, token: str, claims: dict, user: UserSnapshot) -> None:
+        """Cache a verified token until its `exp` or the TTL, whichever is first"""
+        if self.max_size <= 0:
+            return
+        expires_at = self._clock() + self.ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= self._clock():
+            return
+
+        key = self._key(token)
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = _Entry(expires_at, claims, user)
+        self._by_user.setdefault(user.id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop every cached token that belongs to a user"""
+        for key in self._by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _discard(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry.user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry.user.id]
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,258 @@
+#!/usr/bin/python3
+"""
+Rate limiting for login attempts.
+
+Limits use a sliding window counter: the count for the current fixed window
+plus the previous window's count weighted by how much of it still overlaps
+the sliding window. That needs two integers per key instead of a log of
+timestamps, so memory stays flat under credential stuffing.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+from app.core.config import get_settings
+from app.core.exceptions import RateLimitExceededError
+from app.utils.logger import logger
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    window_seconds: int
+
+
+def _sliding_estimate(previous: int, current: int, elapsed: float, window: int) -> float:
+    return previous * (1 - elapsed / window) + current
+
+
+def _retry_after(previous: int, current: int, elapsed: float, rate: RateLimit) -> float:
+    """Seconds until the estimate drops back under the limit"""
+    if current >= rate.limit or previous == 0:
+        # Only the next window can help
+        return rate.window_seconds - elapsed
+    # Wait until enough of the previous window has slid out
+    needed = (previous + current - rate.limit + 1) / previous * rate.window_seconds
+    return max(needed - elapsed, 0.0)
+
+
+class RateLimitBackend:
+    """Storage for rate limit counters; subclasses must be safe to share"""
+
+    async def hit(self, key: str, rate: RateLimit) -> float | None:
+        """Record one attempt; return seconds to wait if over the limit"""
+        raise NotImplementedError
+
+    async def reset(self, key: str, rate: RateLimit) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process counters in an LRU map.
+
+    At most `max_keys` keys are tracked; the least recently hit key is
+    evicted first, so a flood of distinct emails or addresses can not grow
+    memory without bound.
+    """
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> [window index, previous count, current count]
+        self._counters: OrderedDict[str, list[int]] = OrderedDict()
+        self.evictions = 0
+
+    async def hit(self, key: str, rate: RateLimit) -> float | None:
+        now = self.clock()
+        window = int(now // rate.window_seconds)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [window, 0, 0]
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != window:
+                previous = counter[2] if counter[0] == window - 1 else 0
+                counter[:] = [window, previous, 0]
+
+        counter[2] += 1
+        elapsed = now - window * rate.window_seconds
+        if _sliding_estimate(counter[1], counter[2], elapsed, rate.window_seconds) > rate.limit:
+            return _retry_after(counter[1], counter[2], elapsed, rate)
+        return None
+
+    async def reset(self, key: str, rate: RateLimit) -> None:
+        self._counters.pop(key, None)
+
+    def clear(self) -> None:
+        self._counters.clear()
+
+    def stats(self) -> dict:
+        return {"keys": len(self._counters), "evictions": self.evictions}
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Counters in Redis, shared by every worker and host.
+
+    Requires the `redis` extra (uv sync --extra redis). Each window is its own key that expires
+    after two windows, and both reads happen in one round trip. An existing
+    redis.asyncio client can be passed instead of a URL.
+    """
+
+    _SCRIPT = """
+    local current = redis.call('INCR', KEYS[1])
+    if current == 1 then redis.call('EXPIRE', KEYS[1], ARGV[1] * 2) end
+    local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+    return {previous, current}
+    """
+
+    def __init__(
+        self,
+        url: str = "",
+        prefix: str = "ratelimit:",
+        clock: Callable[[], float] = time.time,
+        client=None,
+    ):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise ValueError(
+                    "RATE_LIMIT_STORAGE_URL is set but the redis package is not installed; "
+                    "install the redis extra or leave it empty for per-process limits"
+                ) from e
+            client = redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+        self._hit = self.client.register_script(self._SCRIPT)
+
+    def _window_keys(self, key: str, rate: RateLimit, window: int) -> list[str]:
+        """Keys of the current and previous window counters"""
+        base = f"{self.prefix}{key}:{rate.window_seconds}"
+        return [f"{base}:{window}", f"{base}:{window - 1}"]
+
+    async def hit(self, key: str, rate: RateLimit) -> float | None:
+        now = self.clock()
+        window = int(now // rate.window_seconds)
+        previous, current = await self._hit(
+            keys=self._window_keys(key, rate, window), args=[rate.window_seconds]
+        )
+        elapsed = now - window * rate.window_seconds
+        if _sliding_estimate(previous, current, elapsed, rate.window_seconds) > rate.limit:
+            return _retry_after(previous, current, elapsed, rate)
+        return None
+
+    async def reset(self, key: str, rate: RateLimit) -> None:
+        # Only the two windows hit() reads can hold counts; older ones expire
+        window = int(self.clock() // rate.window_seconds)
+        await self.client.delete(*self._window_keys(key, rate, window))
+
+
+class LoginRateLimiter:
+    """
+    Throttles login attempts by client address and by account.
+
+    `check()` runs before any database or password hashing work and raises
+    RateLimitExceededError once either limit is exceeded. A successful
+    login clears the account's counter so typos do not lock out its owner.
+    If the backend fails, attempts are let through and counted.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        per_ip: RateLimit,
+        per_email: RateLimit,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.enabled = enabled
+        self.checked = 0
+        self.rejected_ip = 0
+        self.rejected_email = 0
+        self.backend_errors = 0
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    async def check(self, ip: str, email: str) -> None:
+        if not self.enabled:
+            return
+        self.checked += 1
+        try:
+            ip_wait = await self.backend.hit(f"login:ip:{ip}", self.per_ip)
+            email_wait = await self.backend.hit(
+                f"login:email:{self.normalize_email(email)}", self.per_email
+            )
+        except Exception as e:
+            self.backend_errors += 1
+            logger.error("Rate limit backend failed: %s", e)
+            return
+
+        if ip_wait is not None:
+            self.rejected_ip += 1
+        if email_wait is not None:
+            self.rejected_email += 1
+        wait = max(ip_wait or 0.0, email_wait or 0.0)
+        if ip_wait is not None or email_wait is not None:
+            raise RateLimitExceededError(retry_after=max(1, math.ceil(wait)))
+
+    async def reset_email(self, email: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            await self.backend.reset(
+                f"login:email:{self.normalize_email(email)}", self.per_email
+            )
+        except Exception as e:
+            self.backend_errors += 1
+            logger.error("Rate limit backend failed: %s", e)
+
+    def stats(self) -> dict:
+        return {
+            "checked": self.checked,
+            "rejected_ip": self.rejected_ip,
+            "rejected_email": self.rejected_email,
+            "backend_errors": self.backend_errors,
+            **self.backend.stats(),
+        }
+
+
+def client_ip(request) -> str:
+    """Address the limits are keyed on"""
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _build_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_STORAGE_URL:
+        return RedisRateLimitBackend(settings.RATE_LIMIT_STORAGE_URL)
+    return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+login_limiter = LoginRateLimiter(
+    backend=_build_backend(),
+    per_ip=RateLimit(settings.LOGIN_RATE_LIMIT_PER_IP, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS),
+    per_email=RateLimit(
+        settings.LOGIN_RATE_LIMIT_PER_EMAIL, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+    ),
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+In-memory revocation set for refresh tokens.
+
+Holds revoked token ids (jti) and revoked token families until the tokens
+would have expired anyway, so a revocation check is a dict lookup rather
+than a query. The refresh_tokens table stays the source of truth: every
+rotation is still a conditional UPDATE there, and this set only lets known
+bad tokens be turned away without touching the database. It is warmed from
+the table on first use in each process.
+"""
+
+import time
+from typing import Callable, Iterable
+
+
+class RevocationStore:
+    """jti and family ids mapped to the epoch time they stop mattering"""
+
+    def __init__(self, purge_every: int = 1000, clock: Callable[[], float] = time.time):
+        self.purge_every = purge_every
+        self.clock = clock
+        self._tokens: dict[str, float] = {}
+        self._families: dict[str, float] = {}
+        self._since_purge = 0
+        self.loaded = False
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        self._tokens[jti] = expires_at
+        self._added()
+
+    def revoke_family(self, family_id: str, expires_at: float) -> None:
+        # Keep the family until the last token that could belong to it expires
+        self._families[family_id] = max(expires_at, self._families.get(family_id, 0.0))
+        self._added()
+
+    def is_token_revoked(self, jti: str) -> bool:
+        return self._alive(self._tokens, jti)
+
+    def is_family_revoked(self, family_id: str) -> bool:
+        return self._alive(self._families, family_id)
+
+    def load(
+        self,
+        tokens: Iterable[tuple[str, float]],
+        families: Iterable[tuple[str, float]] = (),
+    ) -> None:
+        for jti, expires_at in tokens:
+            self._tokens[jti] = expires_at
+        for family_id, expires_at in families:
+            self.revoke_family(family_id, expires_at)
+        self.loaded = True
+
+    def purge(self) -> None:
+        """Drop entries whose tokens have expired"""
+        now = self.clock()
+        for entries in (self._tokens, self._families):
+            for key in [key for key, expires_at in entries.items() if expires_at <= now]:
+                del entries[key]
+        self._since_purge = 0
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._families.clear()
+        self._since_purge = 0
+        self.loaded = False
+
+    def stats(self) -> dict:
+        return {"tokens": len(self._tokens), "families": len(self._families)}
+
+    def _alive(self, entries: dict[str, float], key: str) -> bool:
+        expires_at = entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= self.clock():
+            del entries[key]
+            return False
+        return True
+
+    def _added(self) -> None:
+        # Amortized cleanup keeps the set proportional to live revocations
+        self._since_purge += 1
+        if self._since_purge >= self.purge_every:
+            self.purge()
+
+
+revocations = RevocationStore()
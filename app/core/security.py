@@ -3,15 +3,176 @@
 Docstring for app.core.security
 """
 
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from passlib.context import CryptContext
+from app.core.config import get_settings
+from app.core.metrics import password_hash_duration, timed
 
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+settings = get_settings()
 
+def build_pwd_context(time_cost: int, memory_cost: int, parallelism: int) -> CryptContext:
+    """Argon2 context; hashes made with other parameters report needs_update"""
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
 
-def hash_password(password: str) -> str:
+
+pwd_context = build_pwd_context(
+    settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM
+)
+
+# Cheapest valid parameters; the Argon2 backend it loads is shared with pwd_context
+_warmup_context = build_pwd_context(time_cost=1, memory_cost=8, parallelism=1)
+
+
+def warmup_hash(password: str) -> str:
+    """Load the Argon2 backend in whichever worker runs this, in microseconds"""
+    return _warmup_context.hash(password)
+
+
+def _hash(password: str) -> str:
+    # Runs in the pool, possibly in a child process: metrics are recorded
+    # by the caller, where the registry lives
     return pwd_context.hash(password)
 
 
-def verify_password(password: str, hash: str) -> bool:
+def _verify(password: str, hash: str) -> bool:
     return pwd_context.verify(password, hash)
+
+
+def hash_password(password: str) -> str:
+    with timed(password_hash_duration, "hash"):
+        return _hash(password)
+
+
+def verify_password(password: str, hash: str) -> bool:
+    with timed(password_hash_duration, "verify"):
+        return _verify(password, hash)
+
+
+def password_needs_rehash(hash: str) -> bool:
+    """True if `hash` was made with different parameters than configured"""
+    return pwd_context.needs_update(hash)
+
+
+def _after_barrier(barrier: threading.Barrier, fn, *args):
+    try:
+        barrier.wait(timeout=5)
+    except threading.BrokenBarrierError:
+        pass
+    return fn(*args)
+
+
+class PasswordHasherPool:
+    """
+    Bounded worker pool for Argon2 hashing and verification.
+
+    Argon2 is CPU bound and takes tens of milliseconds per call, so running it
+    on the event loop stalls every other request on the worker. Jobs are
+    submitted to a thread or process pool whose size caps the number of
+    hashes computed concurrently; anything beyond that waits in the
+    executor queue and is reported by `stats()`.
+    """
+
+    def __init__(self, workers: int, kind: str = "thread"):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor kind: {kind}")
+        self.workers = workers
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._failed = 0
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never forks or spawns threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix="password-hasher",
+                        )
+        return self._executor
+
+    def _on_done(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    async def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and await its result"""
+        future = self._get_executor().submit(fn, *args)
+        with self._lock:
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    async def start(self, fn, *args) -> None:
+        """Start every worker now by running `fn(*args)` once on each"""
+        if self.kind == "thread":
+            # A thread that finishes a job is reused for the next one, so each
+            # job holds its thread until all of them are running
+            barrier = threading.Barrier(self.workers)
+            fn = partial(_after_barrier, barrier, fn)
+        # Process pools launch every worker on first submit under fork, and
+        # spawn one per queued job otherwise
+        await asyncio.gather(*(self.run(fn, *args) for _ in range(self.workers)))
+
+    def stats(self) -> dict:
+        """Snapshot of pool load: running jobs, queue depth and totals"""
+        with self._lock:
+            pending = self._pending
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "in_flight": min(pending, self.workers),
+                "queue_depth": max(0, pending - self.workers),
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the underlying executor; it is recreated on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+hasher_pool = PasswordHasherPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    with timed(password_hash_duration, "hash"):
+        return await hasher_pool.run(_hash, password)
+
+
+async def verify_password_async(password: str, hash: str) -> bool:
+    """Verify a password without blocking the event loop"""
+    with timed(password_hash_duration, "verify"):
+        return await hasher_pool.run(_verify, password, hash)
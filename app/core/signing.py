@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+"""
+JWT signing and verification keys.
+
+With a shared-secret algorithm (HS256, the default) tokens are signed with
+SECRET_KEY. With ES256 they are signed by the private key named by
+JWT_ACTIVE_KID and carry that `kid` in their header; any service holding
+the public keys published at /.well-known/jwks.json can verify them.
+
+Keys live in JWT_KEYS_DIR as `<kid>.pem` (private, can sign) or
+`<kid>.pub.pem` (public only, kept to verify tokens signed before a
+rotation). To rotate: add the new private key, point JWT_ACTIVE_KID at it,
+and keep the old key until its tokens have expired.
+
+Every key is parsed once into a python-jose key object. Signing and
+verification reuse those objects instead of re-parsing the secret or PEM
+on each call.
+
+Generate a key: python -m app.core.signing <dir> <kid>
+"""
+
+import sys
+from pathlib import Path
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
+from app.core.config import get_settings
+from app.core.metrics import jwt_duration, timed
+
+settings = get_settings()
+
+ASYMMETRIC_ALGORITHMS = frozenset({"ES256"})
+
+
+class TokenSigner:
+    """Signs and verifies JWTs with pre-built keys"""
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str | None = None,
+        private_keys: dict[str, str] | None = None,
+        public_keys: dict[str, str] | None = None,
+        active_kid: str | None = None,
+    ):
+        self.algorithm = algorithm
+        self.asymmetric = algorithm in ASYMMETRIC_ALGORITHMS
+        self._verifiers: dict[str | None, Key] = {}
+        self._signing_key: Key | None = None
+        self.active_kid = active_kid
+
+        if not self.asymmetric:
+            self._signing_key = jwk.construct(secret, algorithm)
+            self._verifiers[None] = self._signing_key
+            self._headers = None
+            return
+
+        for kid, pem in (private_keys or {}).items():
+            key = jwk.construct(pem, algorithm)
+            self._verifiers[kid] = key.public_key()
+            if kid == active_kid:
+                self._signing_key = key
+        for kid, pem in (public_keys or {}).items():
+            self._verifiers.setdefault(kid, jwk.construct(pem, algorithm))
+        if self._signing_key is None:
+            raise ValueError(f"No private key found for JWT_ACTIVE_KID={active_kid!r}")
+        self._headers = {"kid": active_kid}
+
+    def sign(self, claims: dict) -> str:
+        with timed(jwt_duration, "sign"):
+            return jwt.encode(
+                claims, self._signing_key, algorithm=self.algorithm, headers=self._headers
+            )
+
+    def verify(self, token: str) -> dict:
+        """Return the token's claims; raises JWTError if it does not verify"""
+        with timed(jwt_duration, "verify"):
+            kid = None
+            if self.asymmetric:
+                # jwt's variant raises JWTError, not JWSError, on a malformed token
+                kid = jwt.get_unverified_header(token).get("kid")
+            key = self._verifiers.get(kid)
+            if key is None:
+                raise JWTError("Unknown signing key")
+            return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    def jwks(self) -> dict:
+        """Public keys as a JWK Set; empty for shared-secret algorithms"""
+        if not self.asymmetric:
+            return {"keys": []}
+        keys = []
+        for kid, key in self._verifiers.items():
+            jwk_dict = key.to_dict()
+            jwk_dict.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            keys.append(jwk_dict)
+        return {"keys": keys}
+
+
+def load_key_dir(path: str) -> tuple[dict[str, str], dict[str, str]]:
+    """Read `<kid>.pem` private and `<kid>.pub.pem` public keys from a directory"""
+    private_keys, public_keys = {}, {}
+    for file in sorted(Path(path).glob("*.pem")):
+        if file.name.endswith(".pub.pem"):
+            public_keys[file.name[: -len(".pub.pem")]] = file.read_text()
+        else:
+            private_keys[file.stem] = file.read_text()
+    return private_keys, public_keys
+
+
+def generate_private_key_pem() -> str:
+    """New P-256 private key for ES256"""
+    key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def build_signer() -> TokenSigner:
+    if settings.ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+        return TokenSigner(settings.ALGORITHM, secret=settings.SECRET_KEY)
+    private_keys, public_keys = load_key_dir(settings.JWT_KEYS_DIR)
+    return TokenSigner(
+        settings.ALGORITHM,
+        private_keys=private_keys,
+        public_keys=public_keys,
+        active_kid=settings.JWT_ACTIVE_KID,
+    )
+
+
+token_signer = build_signer()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m app.core.signing <keys dir> <kid>")
+    key_dir, kid = Path(sys.argv[1]), sys.argv[2]
+    key_dir.mkdir(parents=True, exist_ok=True)
+    (key_dir / f"{kid}.pem").write_text(generate_private_key_pem())
+    print(f"Wrote {key_dir / f'{kid}.pem'}; set JWT_ACTIVE_KID={kid} to sign with it")
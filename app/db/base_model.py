@@ -1,9 +1,33 @@
 #!/usr/bin/python3
 """Base model with common fields and methods for all database models"""
 from datetime import datetime, timezone
-from sqlalchemy import DateTime, select
+from typing import Any, AsyncIterator, Sequence
+from sqlalchemy import DateTime, Select, bindparam, inspect, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.exceptions import InvalidCursorError
+from app.db.pagination import Page, decode_cursor, encode_cursor
+from app.db.soft_delete import INCLUDE_DELETED
+
+
+settings = get_settings()
+
+# Dialect-specific INSERT constructs that support ON CONFLICT
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# SELECTs for the fetch helpers, built once per model and filter column set
+_SELECT_CACHE: dict[tuple[type, tuple[str, ...]], Select] = {}
+
+
+def _chunked(rows: Sequence[dict], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
 
 
 class Base(DeclarativeBase):
@@ -16,6 +40,9 @@ class BaseModel(Base):
     """Abstract base model with common fields and methods"""
 
     __abstract__ = True
+    # Server-generated columns come back through RETURNING on flush
+    # instead of a refresh SELECT afterwards
+    __mapper_args__ = {"eager_defaults": True}
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
@@ -41,7 +68,6 @@ class BaseModel(Base):
         db.add(self)
         if commit:
             await db.commit()
-            await db.refresh(self)
         return self
 
     async def update(self, db: AsyncSession, commit: bool = True, **kwargs):
@@ -52,9 +78,65 @@ class BaseModel(Base):
 
         if commit:
             await db.commit()
-            await db.refresh(self)
         return self
 
+    async def update_where(
+        self, db: AsyncSession, conditions: dict | None = None, commit: bool = True, **values
+    ) -> bool:
+        """Update this row only if it still matches `conditions`.
+
+        One UPDATE ... WHERE <pk> AND <conditions> RETURNING statement; the
+        new values are applied to this object. Returns False, leaving the
+        object unchanged, if the row no longer matches.
+        """
+        mapper = inspect(type(self))
+        where = {column.key: getattr(self, column.key) for column in mapper.primary_key}
+        where.update(conditions or {})
+        rows = await type(self).update_returning(db, where, values, commit=commit)
+        if not rows:
+            return False
+        for key, value in rows[0]._mapping.items():
+            set_committed_value(self, key, value)
+        return True
+
+    @classmethod
+    async def update_returning(
+        cls,
+        db: AsyncSession,
+        where: dict,
+        values: dict,
+        returning: Sequence[str] | None = None,
+        criteria: Sequence[Any] = (),
+        commit: bool = True,
+    ) -> list[Any]:
+        """UPDATE rows matching `where` (and any `criteria` clauses) without reading them first.
+
+        Returns a row per updated record with the primary key, `updated_at`
+        and the `returning` columns (by default the updated ones). An empty
+        list means nothing matched. Objects already loaded in the session
+        are updated in place.
+        """
+        names = [column.key for column in inspect(cls).primary_key]
+        for name in (*(returning if returning is not None else values), "updated_at"):
+            if name not in names:
+                names.append(name)
+        stmt = (
+            update(cls)
+            .where(*criteria)
+            .filter_by(**where)
+            .values(**values)
+            .returning(*(getattr(cls, name) for name in names))
+        )
+        try:
+            result = await db.execute(stmt)
+            rows = list(result.all())
+            if commit:
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return rows
+
     async def delete(self, db: AsyncSession, commit: bool = True) -> None:
         """Delete object from db"""
         await db.delete(self)
@@ -62,22 +144,250 @@ class BaseModel(Base):
             await db.commit()
 
     @classmethod
-    async def fetch_one(cls, db: AsyncSession, **kwargs):
+    def _select_by(cls, **kwargs) -> tuple[Select, dict]:
+        """SELECT filtered on `kwargs` and the parameters to execute it with.
+
+        The statement binds one parameter per column and is reused by every
+        lookup on the same columns, so hot lookups skip building the
+        statement and its compiled form comes straight from the engine's
+        cache.
+        """
+        if any(value is None for value in kwargs.values()):
+            # A bound `column = :value` never matches NULL; filter_by emits IS NULL
+            return select(cls).filter_by(**kwargs), {}
+        key = (cls, tuple(sorted(kwargs)))
+        query = _SELECT_CACHE.get(key)
+        if query is None:
+            query = select(cls).filter_by(**{name: bindparam(name) for name in key[1]})
+            _SELECT_CACHE[key] = query
+        return query, kwargs
+
+    @classmethod
+    async def fetch_one(cls, db: AsyncSession, include_deleted: bool = False, **kwargs):
         """Get first matching object"""
-        query = select(cls).filter_by(**kwargs)
-        result = await db.execute(query)
+        query, params = cls._select_by(**kwargs)
+        result = await db.execute(
+            query, params, execution_options={INCLUDE_DELETED: include_deleted}
+        )
         return result.scalars().first()
 
     @classmethod
-    async def fetch_unique(cls, db: AsyncSession, **kwargs):
+    async def fetch_unique(cls, db: AsyncSession, include_deleted: bool = False, **kwargs):
         """Get unique object or None (raises error if multiple found)"""
-        query = select(cls).filter_by(**kwargs)
-        result = await db.execute(query)
+        query, params = cls._select_by(**kwargs)
+        result = await db.execute(
+            query, params, execution_options={INCLUDE_DELETED: include_deleted}
+        )
         return result.scalars().one_or_none()
 
     @classmethod
-    async def fetch_all(cls, db: AsyncSession, **kwargs):
+    async def fetch_all(cls, db: AsyncSession, include_deleted: bool = False, **kwargs):
         """Get all matching objects"""
-        query = select(cls).filter_by(**kwargs)
-        result = await db.execute(query)
+        query, params = cls._select_by(**kwargs)
+        result = await db.execute(
+            query, params, execution_options={INCLUDE_DELETED: include_deleted}
+        )
         return list(result.scalars().all())
+
+    @classmethod
+    def _keyset_query(cls, columns: Sequence[str] | None, **kwargs):
+        """SELECT ordered by (created_at, pk), projecting `columns` if given.
+
+        Projections always carry created_at and the primary key so the
+        position of the last row can be turned into a cursor.
+        """
+        pk = inspect(cls).primary_key[0]
+        if columns:
+            names = list(columns)
+            for required in ("created_at", pk.key):
+                if required not in names:
+                    names.append(required)
+            query = select(*(getattr(cls, name) for name in names))
+        else:
+            query = select(cls)
+        return query.filter_by(**kwargs).order_by(cls.created_at, pk), pk
+
+    @classmethod
+    async def paginate(
+        cls,
+        db: AsyncSession,
+        cursor: str | None = None,
+        limit: int | None = None,
+        columns: Sequence[str] | None = None,
+        **kwargs,
+    ) -> Page:
+        """Get one page of matching objects (or row tuples) after `cursor`"""
+        size = max(1, min(limit or settings.DEFAULT_PAGE_SIZE, settings.MAX_PAGE_SIZE))
+        query, pk = cls._keyset_query(columns, **kwargs)
+
+        if cursor is not None:
+            created_at, key = decode_cursor(cursor)
+            try:
+                key = pk.type.python_type(key)
+            except (ValueError, TypeError):
+                raise InvalidCursorError()
+            query = query.where(tuple_(cls.created_at, pk) > tuple_(created_at, key))
+
+        result = await db.execute(query.limit(size + 1))
+        items = list(result.all() if columns else result.scalars().all())
+
+        next_cursor = None
+        if len(items) > size:
+            items = items[:size]
+            last = items[-1]
+            next_cursor = encode_cursor(last.created_at, getattr(last, pk.key))
+        return Page(items=items, next_cursor=next_cursor)
+
+    @classmethod
+    async def stream_all(
+        cls,
+        db: AsyncSession,
+        columns: Sequence[str] | None = None,
+        batch_size: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        """Iterate over all matching objects (or row tuples) with a server-side cursor"""
+        query, _ = cls._keyset_query(columns, **kwargs)
+        query = query.execution_options(yield_per=batch_size or settings.MAX_PAGE_SIZE)
+        result = await db.stream(query)
+        rows = result if columns else result.scalars()
+        async for row in rows:
+            yield row
+
+    @classmethod
+    def _upsert_insert(cls, db: AsyncSession):
+        """INSERT construct for the session's dialect that supports ON CONFLICT"""
+        dialect = db.get_bind().dialect.name
+        try:
+            return _UPSERT_INSERTS[dialect](cls)
+        except KeyError:
+            raise NotImplementedError(f"Bulk upserts are not supported on {dialect}")
+
+    @classmethod
+    async def _bulk_write(
+        cls,
+        db: AsyncSession,
+        stmt,
+        rows: Sequence[dict],
+        chunk_size: int | None,
+        returning: bool,
+        commit: bool,
+    ) -> list[Any] | None:
+        pk_columns = inspect(cls).primary_key
+        if returning:
+            stmt = stmt.returning(*pk_columns)
+
+        keys: list[Any] = []
+        try:
+            for chunk in _chunked(rows, chunk_size or settings.DB_BULK_CHUNK_SIZE):
+                result = await db.execute(stmt, list(chunk))
+                if returning:
+                    if len(pk_columns) == 1:
+                        keys.extend(result.scalars().all())
+                    else:
+                        keys.extend(tuple(row) for row in result.all())
+            if commit:
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        return keys if returning else None
+
+    @classmethod
+    async def insert_unless_exists(
+        cls,
+        db: AsyncSession,
+        conflict_columns: Sequence[Any],
+        conflict_where: Any = None,
+        **values,
+    ):
+        """Insert one row unless it collides on `conflict_columns`.
+
+        A single INSERT ... ON CONFLICT DO NOTHING RETURNING: column defaults
+        are filled in by the INSERT and the new row comes back with it, so no
+        refresh is needed. Returns the new object, or None if a matching row
+        already exists. Does not commit.
+
+        `conflict_columns` names the columns (or expressions) of the unique
+        index to check, and `conflict_where` its predicate if it is partial.
+        """
+        stmt = (
+            cls._upsert_insert(db)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=conflict_columns, index_where=conflict_where)
+            .returning(cls)
+        )
+        result = await db.execute(stmt)
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def bulk_insert(
+        cls,
+        db: AsyncSession,
+        rows: Sequence[dict],
+        chunk_size: int | None = None,
+        returning: bool = False,
+        ignore_conflicts: bool = False,
+        commit: bool = True,
+    ) -> list[Any] | None:
+        """Insert many rows with multi-row INSERTs in a single transaction.
+
+        Rows that hit a unique constraint are skipped when `ignore_conflicts`
+        is set. Returns the new primary keys if `returning` is set.
+        """
+        if not rows:
+            return [] if returning else None
+        stmt = cls._upsert_insert(db)
+        if ignore_conflicts:
+            stmt = stmt.on_conflict_do_nothing()
+        return await cls._bulk_write(db, stmt, rows, chunk_size, returning, commit)
+
+    @classmethod
+    async def upsert_many(
+        cls,
+        db: AsyncSession,
+        rows: Sequence[dict],
+        conflict_columns: Sequence[Any],
+        update_columns: Sequence[str] | None = None,
+        conflict_where: Any = None,
+        chunk_size: int | None = None,
+        returning: bool = False,
+        commit: bool = True,
+    ) -> list[Any] | None:
+        """Insert rows, updating existing ones that collide on `conflict_columns`.
+
+        By default every supplied column except the conflict and primary key
+        columns is overwritten, along with `updated_at`. `conflict_where` is
+        the predicate of a partial unique index.
+        """
+        if not rows:
+            return [] if returning else None
+
+        if update_columns is None:
+            skip = {c for c in conflict_columns if isinstance(c, str)}
+            skip |= {c.key for c in inspect(cls).primary_key}
+            skip.add("created_at")
+            update_columns = sorted({key for row in rows for key in row} - skip)
+
+        stmt = cls._upsert_insert(db)
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        set_["updated_at"] = stmt.excluded.updated_at
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns, index_where=conflict_where, set_=set_
+        )
+        return await cls._bulk_write(db, stmt, rows, chunk_size, returning, commit)
+
+    @classmethod
+    async def bulk_update(
+        cls,
+        db: AsyncSession,
+        rows: Sequence[dict],
+        chunk_size: int | None = None,
+        commit: bool = True,
+    ) -> None:
+        """Update many rows by primary key; each row must include the key"""
+        if not rows:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [row if "updated_at" in row else {**row, "updated_at": now} for row in rows]
+        await cls._bulk_write(db, update(cls), rows, chunk_size, False, commit)
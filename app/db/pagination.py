@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""Keyset pagination helpers for BaseModel queries"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+from app.core.exceptions import InvalidCursorError
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results and the opaque cursor for the next one"""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(created_at: datetime, key: Any) -> str:
+    """Encode the (created_at, id) position of the last row on a page"""
+    raw = json.dumps([created_at.isoformat(), str(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor produced by `encode_cursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, key = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), key
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursorError()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+Instrumented connection pool for the async engines
+"""
+
+import asyncio
+import time
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long checkouts wait.
+
+    The wait covers both queueing for a free connection and opening a new
+    overflow connection, which is what a request actually pays before its
+    first statement runs.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.acquisitions += 1
+            self.total_wait += waited
+            if waited > self.max_wait:
+                self.max_wait = waited
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict:
+    """Current occupancy and wait counters for an engine's pool"""
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+    }
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats.update(
+            {
+                "acquisitions": pool.acquisitions,
+                "timeouts": pool.timeouts,
+                "total_wait_seconds": pool.total_wait,
+                "avg_wait_seconds": (
+                    pool.total_wait / pool.acquisitions if pool.acquisitions else 0.0
+                ),
+                "max_wait_seconds": pool.max_wait,
+            }
+        )
+    return stats
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Open up to `connections` connections at once, ping each and return them
+    to the pool, so the first requests do not pay for connecting.
+
+    Returns the number of connections opened.
+    """
+    size = engine.pool.size() if hasattr(engine.pool, "size") else connections
+    count = max(0, min(connections, size))
+
+    async def ping():
+        conn = await engine.connect().start()
+        try:
+            await conn.execute(text("SELECT 1"))
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    results = await asyncio.gather(*(ping() for _ in range(count)), return_exceptions=True)
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return count
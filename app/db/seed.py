@@ -12,7 +12,7 @@ async def seed():
     async with SessionLocal() as db:
         try:
             admin_email = "admin@hotspot.com"
-            admin = await User.fetch_unique(db, email=admin_email)
+            admin = await User.fetch_by_email(db, admin_email)
             if not admin:
                 logger.info(f"Creating super admin: {admin_email}")
                 admin = User(
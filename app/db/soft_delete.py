@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Soft deletes.
+
+Models with SoftDeleteMixin are marked deleted instead of being removed.
+Every ORM SELECT on them leaves deleted rows out, through a loader
+criteria added to each session query; execute with
+execution_options(include_deleted=True) (or pass include_deleted=True to
+the BaseModel fetch helpers) to see them. Loads of attributes on objects
+already in the session are not filtered.
+
+Deleted rows are hard-deleted by purge_deleted() once they are older than
+the retention period, a small batch per transaction so no lock is held
+for long (see app.workers.purge_deleted).
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from sqlalchemy import Boolean, DateTime, delete, event, false, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, ORMExecuteState, Session, mapped_column, with_loader_criteria
+
+# Execution option that turns the filter off for one statement
+INCLUDE_DELETED = "include_deleted"
+
+
+def _utcnow() -> datetime:
+    # deleted_at is a timestamp without time zone; it holds naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class SoftDeleteMixin:
+    """Mark rows deleted instead of removing them; for BaseModel subclasses"""
+
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    @classmethod
+    def not_deleted(cls):
+        """WHERE clause for live rows; partial indexes use the same predicate"""
+        return cls.is_deleted == false()
+
+    async def soft_delete(self, db: AsyncSession, commit: bool = True) -> bool:
+        """Mark this row deleted; returns False if it already was"""
+        return await self.update_where(
+            db, {"is_deleted": False}, commit=commit, is_deleted=True, deleted_at=_utcnow()
+        )
+
+    @classmethod
+    async def purge_deleted(
+        cls,
+        db: AsyncSession,
+        older_than: datetime,
+        batch_size: int,
+        pause: float = 0.0,
+    ) -> int:
+        """Hard-delete rows soft-deleted before `older_than`, `batch_size` per commit.
+
+        Each batch selects its keys in deleted_at order, skipping rows locked
+        by another purge, deletes them and commits before the next batch.
+        Returns the number of rows removed.
+        """
+        if older_than.tzinfo is not None:
+            older_than = older_than.astimezone(timezone.utc).replace(tzinfo=None)
+        pk = cls.__mapper__.primary_key[0]
+        batch = (
+            select(pk)
+            .where(cls.is_deleted == true(), cls.deleted_at < older_than)
+            .order_by(cls.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .execution_options(**{INCLUDE_DELETED: True})
+        )
+
+        purged = 0
+        while True:
+            try:
+                keys = (await db.execute(batch)).scalars().all()
+                if keys:
+                    await db.execute(
+                        delete(cls)
+                        .where(pk.in_(keys))
+                        .execution_options(synchronize_session=False)
+                    )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            purged += len(keys)
+            if len(keys) < batch_size:
+                return purged
+            if pause:
+                await asyncio.sleep(pause)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_deleted(execute_state: ORMExecuteState) -> None:
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.is_deleted == false(),
+                include_aliases=True,
+            )
+        )
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""
+Application startup and shutdown.
+
+Startup warms what the first requests would otherwise pay for: pooled
+database connections, the password hashing workers and Argon2 backend,
+the JWT key objects, the request and response schemas, the compiled
+email templates and the token revocation set. Each phase is timed and
+logged. Only the database phases may fail without aborting startup,
+since the pool reconnects on its own once the database is reachable.
+
+Shutdown waits up to SHUTDOWN_DRAIN_SECONDS for background tasks that
+outlive their request (password rehashes), then closes the hashing
+workers, idle SMTP connections and the engines.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI
+from app.core.config import get_settings
+from app.core.security import hasher_pool, warmup_hash
+from app.core.signing import token_signer
+from app.db.pool import warm_pool
+from app.db.session import SessionLocal, engine, replica_engines
+from app.schemas.token import RefreshTokenRequest, Token
+from app.schemas.user import (
+    UserLoginRequest,
+    UserRegistrationRequest,
+    UserRegistrationResponse,
+)
+from app.services.auth_service import rehash_tasks
+from app.services.email_templates import email_templates
+from app.services.mail_transport import mail_transport
+from app.services.refresh_token_service import RefreshTokenService
+from app.utils.logger import logger
+from app.utils.responses import success_response
+
+settings = get_settings()
+
+WARMUP_PASSWORD = "warmup-Password-123!"
+
+
+def _example(schema) -> dict:
+    return schema.model_config["json_schema_extra"]["example"]
+
+
+# Schemas the auth routes validate and send, with one valid payload each
+WARMUP_SCHEMAS = (
+    (UserRegistrationRequest, _example(UserRegistrationRequest)),
+    (UserLoginRequest, _example(UserLoginRequest)),
+    (UserRegistrationResponse, _example(UserRegistrationResponse)),
+    (RefreshTokenRequest, {"refresh_token": "warmup"}),
+    (Token, {"access_token": "warmup", "refresh_token": "warmup"}),
+)
+
+
+class PhaseTimer:
+    """Runs named phases and records how long each took, in milliseconds"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.timings: dict[str, float] = {}
+
+    async def run(self, name: str, phase, required: bool = True) -> None:
+        start = time.perf_counter()
+        try:
+            await phase()
+        except Exception as e:
+            if required:
+                raise
+            logger.warning("%s phase %s failed: %s", self.label, name, e)
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def report(self) -> None:
+        total = round(sum(self.timings.values()), 1)
+        logger.info(
+            "%s finished in %.1fms", self.label, total, extra={"phases_ms": self.timings}
+        )
+
+
+async def warm_database() -> None:
+    for target in (engine, *replica_engines):
+        await warm_pool(target, settings.DB_POOL_MIN_CONNECTIONS)
+
+
+async def warm_password_hasher() -> None:
+    # One cheap job per worker starts every thread (or process) and loads
+    # the Argon2 backend without spending a full-cost hash on it
+    await hasher_pool.start(warmup_hash, WARMUP_PASSWORD)
+
+
+async def warm_token_signer() -> None:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=1)
+    token_signer.verify(token_signer.sign({"sub": "warmup", "exp": expire}))
+
+
+async def warm_schemas() -> None:
+    # Validators are built at import; this pays the one-off costs of the
+    # first validation (email validation setup) and of the first envelope
+    # dump of each model
+    for schema, example in WARMUP_SCHEMAS:
+        success_response(200, "warmup", schema.model_validate(example))
+
+
+async def load_email_templates() -> None:
+    email_templates.load()
+
+
+async def load_revocations() -> None:
+    async with SessionLocal() as db:
+        await RefreshTokenService.ensure_revocations_loaded(db)
+
+
+async def startup() -> PhaseTimer:
+    timer = PhaseTimer("Startup")
+    await timer.run("database", warm_database, required=False)
+    await timer.run("password_hasher", warm_password_hasher)
+    await timer.run("token_signer", warm_token_signer)
+    await timer.run("schemas", warm_schemas)
+    await timer.run("email_templates", load_email_templates)
+    await timer.run("revocations", load_revocations, required=False)
+    timer.report()
+    return timer
+
+
+async def drain_background_tasks() -> None:
+    pending = set(rehash_tasks)
+    if not pending:
+        return
+    done, pending = await asyncio.wait(pending, timeout=settings.SHUTDOWN_DRAIN_SECONDS)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning("Cancelled %s background tasks still running at shutdown", len(pending))
+
+
+async def close_password_hasher() -> None:
+    await asyncio.to_thread(hasher_pool.shutdown)
+
+
+async def dispose_engines() -> None:
+    for target in (engine, *replica_engines):
+        await target.dispose()
+
+
+async def shutdown() -> PhaseTimer:
+    timer = PhaseTimer("Shutdown")
+    await timer.run("background_tasks", drain_background_tasks, required=False)
+    await timer.run("password_hasher", close_password_hasher, required=False)
+    await timer.run("mail_transport", mail_transport.close, required=False)
+    await timer.run("database", dispose_engines, required=False)
+    timer.report()
+    return timer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.startup_timings = (await startup()).timings
+    yield
+    await shutdown()
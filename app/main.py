@@ -3,9 +3,23 @@
 Main Application Entry Point
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import login_limiter
+from app.core.revocation import revocations
+from app.core.security import hasher_pool
+from app.core.signing import token_signer
+from app.db.session import pool_stats
+from app.lifespan import lifespan
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.pipeline import MiddlewarePipeline
+from app.middleware.request_id import REQUEST_ID_HEADER, RequestIdMiddleware
+from app.services.mail_transport import mail_transport
+from app.utils.logger import logging_stats
 from app.api.v1.routes import app as api_v1_router
 
 
@@ -18,6 +32,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 origins = [
@@ -27,13 +42,41 @@ origins = [
     "http://localhost:5173",
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+def build_middleware() -> MiddlewarePipeline:
+    """The middleware stack, outermost first"""
+    pipeline = MiddlewarePipeline()
+    pipeline.add("request_id", RequestIdMiddleware)
+    if settings.METRICS_ENABLED:
+        pipeline.add("metrics", MetricsMiddleware, skip_paths={"/metrics"})
+    if settings.GZIP_MINIMUM_SIZE > 0:
+        pipeline.add("gzip", GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+    pipeline.add(
+        "cors",
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[REQUEST_ID_HEADER],
+    )
+    for name, paths in settings.MIDDLEWARE_SKIP_PATHS.items():
+        if name in pipeline.names:
+            pipeline.skip(name, *paths)
+    return pipeline
+
+
+middleware = build_middleware()
+middleware.install(app)
+
+if settings.METRICS_ENABLED:
+    metrics.register_collector("db_pool", pool_stats)
+    metrics.register_collector("password_hasher", hasher_pool.stats)
+    metrics.register_collector("principal_cache", principal_cache.stats)
+    metrics.register_collector("login_rate_limit", login_limiter.stats)
+    metrics.register_collector("token_revocations", revocations.stats)
+    metrics.register_collector("smtp_pool", mail_transport.stats)
+    metrics.register_collector("logging", logging_stats)
 
 app.include_router(api_v1_router, prefix="/api/v1")
 
@@ -50,3 +93,17 @@ async def read_root():
 @app.get("/health", tags=["Home"])
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/.well-known/jwks.json", tags=["Home"])
+async def jwks():
+    """Public keys for verifying access tokens"""
+    return token_signer.jwks()
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", tags=["Home"], include_in_schema=False)
+    async def prometheus_metrics():
+        """Request, database, hashing and JWT timings in the Prometheus text format"""
+        return Response(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Request metrics middleware"""
+
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import (
+    RequestDbStats,
+    http_request_db_duration,
+    http_request_db_queries,
+    http_request_duration,
+    request_db_stats,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, so /users/1 and /users/2 share a series"""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    Records latency per route template, method and status, plus the
+    number and duration of database queries made for the request.
+
+    Timing stops when the last body chunk is sent, so background tasks
+    that run after the response do not inflate request latency.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        db_stats = RequestDbStats()
+        token = request_db_stats.set(db_stats)
+        status = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            recorded = True
+            method, route = scope["method"], route_template(scope)
+            http_request_duration.observe(time.perf_counter() - start, method, route, str(status))
+            http_request_db_queries.observe(db_stats.queries, method, route)
+            http_request_db_duration.observe(db_stats.seconds, method, route)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_db_stats.reset(token)
+            if not recorded:
+                record()
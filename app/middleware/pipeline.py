@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+Ordered registry of pure ASGI middleware.
+
+Middleware is listed outermost first, each under a name, and can be
+skipped for specific paths (health probes, the metrics scrape). Only
+pure ASGI classes belong here: `BaseHTTPMiddleware` runs the rest of the
+stack in a separate task and buffers the request body through
+`call_next`, which costs every request.
+
+    pipeline = MiddlewarePipeline()
+    pipeline.add("request_id", RequestIdMiddleware, skip_paths={"/health"})
+    pipeline.add("cors", CORSMiddleware, allow_origins=["*"])
+    pipeline.install(app)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class MiddlewareSpec:
+    name: str
+    middleware_class: type
+    options: dict[str, Any] = field(default_factory=dict)
+    skip_paths: frozenset[str] = frozenset()
+    skip_prefixes: tuple[str, ...] = ()
+
+
+class SkipPaths:
+    """
+    Runs the `wrapped` middleware except for the listed paths, which go straight
+    to the next app. The path check happens before the wrapped middleware
+    does any work, so a skipped request pays one set lookup.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        wrapped: type,
+        skip_paths: frozenset[str] = frozenset(),
+        skip_prefixes: tuple[str, ...] = (),
+        **options,
+    ):
+        self.app = app
+        self.middleware = wrapped(app, **options)
+        self.skip_paths = skip_paths
+        self.skip_prefixes = skip_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path in self.skip_paths or (
+                self.skip_prefixes and path.startswith(self.skip_prefixes)
+            ):
+                await self.app(scope, receive, send)
+                return
+        await self.middleware(scope, receive, send)
+
+
+class MiddlewarePipeline:
+    def __init__(self, specs: Iterable[MiddlewareSpec] = ()):
+        self._specs: list[MiddlewareSpec] = list(specs)
+
+    def __iter__(self) -> Iterator[MiddlewareSpec]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def add(
+        self,
+        name: str,
+        middleware_class: type,
+        *,
+        skip_paths: Iterable[str] = (),
+        skip_prefixes: Iterable[str] = (),
+        **options,
+    ) -> None:
+        """Append a middleware inside the ones already added"""
+        if name in self.names:
+            raise ValueError(f"Middleware {name!r} is already registered")
+        self._specs.append(
+            MiddlewareSpec(
+                name,
+                middleware_class,
+                options,
+                frozenset(skip_paths),
+                tuple(skip_prefixes),
+            )
+        )
+
+    def skip(self, name: str, *paths: str) -> None:
+        """Opt `paths` out of the middleware registered as `name`"""
+        for index, spec in enumerate(self._specs):
+            if spec.name == name:
+                self._specs[index] = MiddlewareSpec(
+                    spec.name,
+                    spec.middleware_class,
+                    spec.options,
+                    spec.skip_paths | frozenset(paths),
+                    spec.skip_prefixes,
+                )
+                return
+        raise KeyError(name)
+
+    @property
+    def names(self) -> list[str]:
+        """Registered middleware, outermost first"""
+        return [spec.name for spec in self._specs]
+
+    def _layer(self, spec: MiddlewareSpec) -> tuple[type, dict]:
+        if not spec.skip_paths and not spec.skip_prefixes:
+            return spec.middleware_class, spec.options
+        return SkipPaths, {
+            "wrapped": spec.middleware_class,
+            "skip_paths": spec.skip_paths,
+            "skip_prefixes": spec.skip_prefixes,
+            **spec.options,
+        }
+
+    def wrap(self, app: ASGIApp) -> ASGIApp:
+        """Build the stack around a plain ASGI app"""
+        for spec in reversed(self._specs):
+            middleware_class, options = self._layer(spec)
+            app = middleware_class(app, **options)
+        return app
+
+    def install(self, app) -> None:
+        """Register the stack on a Starlette/FastAPI app"""
+        # add_middleware puts each new entry outside the previous ones
+        for spec in reversed(self._specs):
+            middleware_class, options = self._layer(spec)
+            app.add_middleware(middleware_class, **options)
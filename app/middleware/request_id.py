@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Request ID middleware"""
+
+import logging
+import re
+import time
+import uuid
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import get_settings
+from app.middleware.metrics import route_template
+from app.utils.logger import correlation_id_context, logger
+
+settings = get_settings()
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Client IDs end up in log lines and SQL comments, so only accept plain tokens
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+def resolve_request_id(value: str | None) -> str:
+    """Use the caller's request ID if it is well formed, otherwise make one"""
+    if value and _VALID_REQUEST_ID.fullmatch(value):
+        return value
+    return uuid.uuid4().hex
+
+
+class RequestIdMiddleware:
+    """
+    Accepts or generates an X-Request-ID and makes it the correlation ID
+    for everything the request does: log lines, SQL comments and the
+    BackgroundTasks that run after the response, which execute inside
+    this middleware's context. The ID is echoed in the response header.
+
+    One line is logged per request once the response body is sent, with
+    its duration; requests slower than SLOW_REQUEST_MS log a warning.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = resolve_request_id(Headers(scope=scope).get(REQUEST_ID_HEADER))
+        token = correlation_id_context.set(request_id)
+        status = 500
+        logged = False
+
+        def log_request() -> None:
+            nonlocal logged
+            logged = True
+            duration_ms = (time.perf_counter() - start) * 1000
+            slow = duration_ms >= settings.SLOW_REQUEST_MS
+            logger.log(
+                logging.WARNING if slow else logging.INFO,
+                "%s %s %s %.1fms",
+                scope["method"],
+                scope["path"],
+                status,
+                duration_ms,
+                extra={
+                    "method": scope["method"],
+                    "route": route_template(scope),
+                    "status": status,
+                    "duration_ms": round(duration_ms, 3),
+                    "slow": slow,
+                },
+            )
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                log_request()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not logged:
+                log_request()
+            correlation_id_context.reset(token)
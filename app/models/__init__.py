@@ -3,6 +3,8 @@
 Docstring for app.models.__init__ - Initialize models.
 """
 from .user import User
+from .email_outbox import EmailOutbox
+from .refresh_token import RefreshToken
 
 
-__all__ = ["User"]
+__all__ = ["User", "EmailOutbox", "RefreshToken"]
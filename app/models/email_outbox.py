@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""Email outbox model definition."""
+from __future__ import annotations
+from datetime import datetime, timezone
+import uuid
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text
+from app.db.base_model import BaseModel
+
+
+class EmailOutbox(BaseModel):
+    """Email waiting to be delivered by the outbox worker."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Workers claim due pending rows in next_attempt_at order
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True, default=uuid.uuid4, nullable=False
+    )
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    last_error: Mapped[str | None] = mapped_column(Text)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
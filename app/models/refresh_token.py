@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""Refresh token model definition."""
+from __future__ import annotations
+from datetime import datetime
+import uuid
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, ForeignKey, Index
+from app.db.base_model import BaseModel
+
+
+class RefreshToken(BaseModel):
+    """Issued refresh token; the id is the token's jti."""
+
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Loading the revocation set reads only revoked, unexpired rows
+        Index("ix_refresh_tokens_revoked_at_expires_at", "revoked_at", "expires_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True, default=uuid.uuid4, nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    family_id: Mapped[uuid.UUID] = mapped_column(index=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
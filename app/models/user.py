@@ -1,26 +1,148 @@
 #!/usr/bin/python3
 """User model definition."""
 from __future__ import annotations
-from datetime import datetime
 import uuid
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Boolean, String, DateTime
+from typing import Any, Sequence
+from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy import (
+    Boolean, String, Index, bindparam, column, event, false, func, inspect, select, text, true
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.base_model import BaseModel
+from app.db.soft_delete import INCLUDE_DELETED, SoftDeleteMixin
+from app.core.principal_cache import principal_cache
 
 
-class User(BaseModel):
+class User(SoftDeleteMixin, BaseModel):
     """User model representing system users."""
 
+    # Fields copied into cached principals; changing any of them drops the
+    # cache, see _collect_principal_changes() for changes made through the ORM
+    PRINCIPAL_FIELDS = frozenset(
+        {"email", "full_name", "role", "is_active", "is_deleted", "email_verified"}
+    )
+
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Serves every email lookup, see fetch_by_email(). Deleted users
+        # are left out so their email can be registered again
+        Index(
+            "ux_users_email_lower",
+            text("lower(email)"),
+            unique=True,
+            postgresql_where=column("is_deleted") == false(),
+            sqlite_where=column("is_deleted") == false(),
+        ),
+        # Finds rows for the purge job, see SoftDeleteMixin.purge_deleted()
+        Index(
+            "ix_users_deleted_at",
+            "deleted_at",
+            postgresql_where=column("is_deleted") == true(),
+            sqlite_where=column("is_deleted") == true(),
+        ),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True, default=uuid.uuid4, index=True, nullable=False
     )
-    email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    email: Mapped[str] = mapped_column(String(255))
     password_hash: Mapped[str] = mapped_column(String(255))
     full_name: Mapped[str] = mapped_column(String(255))
     phone: Mapped[str | None] = mapped_column(String(20))
     email_verified: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
     role: Mapped[str] = mapped_column(String(50), default="user", nullable=False)
-    deleted_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """The form emails are stored and looked up in"""
+        return email.strip().lower()
+
+    @classmethod
+    def email_matches(cls, email: str):
+        """WHERE clause for one email that the lower(email) index serves"""
+        return func.lower(cls.email) == cls.normalize_email(email)
+
+    @classmethod
+    async def fetch_by_email(
+        cls, db: AsyncSession, email: str, include_deleted: bool = False
+    ) -> User | None:
+        """Get the live user with this email, ignoring case"""
+        result = await db.execute(
+            _SELECT_BY_EMAIL,
+            {"email": cls.normalize_email(email)},
+            execution_options={INCLUDE_DELETED: include_deleted},
+        )
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def update_returning(cls, db: AsyncSession, where: dict, values: dict, **kwargs):
+        """Update rows and invalidate cached principals of the users changed"""
+        rows = await super().update_returning(db, where, values, **kwargs)
+        if cls.PRINCIPAL_FIELDS.intersection(values):
+            for row in rows:
+                principal_cache.invalidate_user(row.id)
+        return rows
+
+    @classmethod
+    async def upsert_many(
+        cls,
+        db: AsyncSession,
+        rows: Sequence[dict],
+        conflict_columns: Sequence[Any],
+        update_columns: Sequence[str] | None = None,
+        returning: bool = False,
+        **kwargs,
+    ) -> list[Any] | None:
+        """Upsert rows and invalidate cached principals if auth state is written"""
+        written = (
+            set(update_columns) if update_columns is not None else {k for row in rows for k in row}
+        )
+        if not cls.PRINCIPAL_FIELDS.intersection(written):
+            return await super().upsert_many(
+                db, rows, conflict_columns, update_columns, returning=returning, **kwargs
+            )
+        ids = await super().upsert_many(
+            db, rows, conflict_columns, update_columns, returning=True, **kwargs
+        )
+        for user_id in ids:
+            principal_cache.invalidate_user(user_id)
+        return ids if returning else None
+
+    @classmethod
+    async def bulk_update(cls, db: AsyncSession, rows: Sequence[dict], **kwargs) -> None:
+        """Update rows by id and invalidate cached principals if auth state changed"""
+        await super().bulk_update(db, rows, **kwargs)
+        for row in rows:
+            if cls.PRINCIPAL_FIELDS.intersection(row):
+                principal_cache.invalidate_user(row["id"])
+
+
+_SELECT_BY_EMAIL = select(User).where(func.lower(User.email) == bindparam("email"))
+
+# session.info key for ids of users whose principal fields were flushed
+_CHANGED_PRINCIPALS = "changed_principals"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session: Session, flush_context) -> None:
+    # Attribute history still holds the flushed changes here, whether they
+    # came from User.update(**fields) or from assignments before a commit
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and (
+            obj in session.deleted
+            or any(inspect(obj).attrs[name].history.has_changes() for name in User.PRINCIPAL_FIELDS)
+        ):
+            session.info.setdefault(_CHANGED_PRINCIPALS, set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_PRINCIPALS, ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session: Session) -> None:
+    session.info.pop(_CHANGED_PRINCIPALS, None)
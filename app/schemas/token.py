@@ -7,9 +7,15 @@ from pydantic import BaseModel
 class Token(BaseModel):
     """Schema for authentication token"""
     access_token: str
+    refresh_token: str | None = None
     token_type: str = "bearer"
 
 
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging a refresh token"""
+    refresh_token: str
+
+
 class TokenPayload(BaseModel):
     """Schema for token payload"""
     sub: str | None = None
@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+"""
+Production server: python -m app.server
+
+The parent process imports the application once, binds the listening
+socket and forks one uvicorn worker per CPU. Workers inherit the
+imported modules, compiled templates and parsed signing keys
+copy-on-write instead of each loading them again, and all of them
+accept from the same socket, so a worker that is recycling never leaves
+the port unserved. Each worker runs uvloop and httptools.
+
+Database connections, executors and the event loop are only created
+after the fork, inside each worker. Logging restarts its listener thread
+around every fork (see app.utils.logger).
+
+With SERVER_MAX_REQUESTS set, a worker stops accepting after that many
+requests (plus up to SERVER_MAX_REQUESTS_JITTER so they do not all go at
+once), finishes what it has in flight and is replaced. SIGTERM or SIGINT
+shuts all workers down gracefully; SIGHUP replaces them one at a time.
+"""
+
+import math
+import os
+import random
+import signal
+import socket
+import sys
+import time
+import warnings
+from pathlib import Path
+import uvicorn
+from app.core.config import get_settings
+from app.utils.logger import logger, shutdown_logging
+
+settings = get_settings()
+
+# uvicorn's exit status when the app fails to start
+STARTUP_FAILURE = 3
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, honouring affinity and a cgroup v2 quota"""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            count = min(count, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return count
+
+
+def worker_count() -> int:
+    return settings.SERVER_WORKERS if settings.SERVER_WORKERS > 0 else available_cpus()
+
+
+def build_config(app, max_requests: int | None = None) -> uvicorn.Config:
+    """uvicorn settings for one worker"""
+    return uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY or None,
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        # RequestIdMiddleware already logs one line per request
+        access_log=False,
+        server_header=False,
+        log_config=None,
+    )
+
+
+def worker_max_requests() -> int | None:
+    if settings.SERVER_MAX_REQUESTS <= 0:
+        return None
+    return settings.SERVER_MAX_REQUESTS + random.randint(
+        0, max(settings.SERVER_MAX_REQUESTS_JITTER, 0)
+    )
+
+
+def _ignore_signal(signum, frame) -> None:
+    pass
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """Forks workers sharing one listening socket and keeps them running"""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children: set[int] = set()
+        self._stopping = False
+        self._reload = False
+
+    def spawn(self) -> int:
+        with warnings.catch_warnings():
+            # The only thread, the log listener, is stopped by an at-fork hook,
+            # but the OS may not have reaped it yet when CPython counts threads
+            warnings.filterwarnings("ignore", "This process .* is multi-threaded", DeprecationWarning)
+            pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return pid
+
+        # Worker process: never return into the supervisor's stack
+        server, status = None, STARTUP_FAILURE
+        try:
+            # uvicorn re-raises SIGTERM/SIGINT after a graceful shutdown; with
+            # these no-ops the worker reaches `finally` and flushes its logs
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, _ignore_signal)
+            signal.signal(signal.SIGHUP, signal.SIG_DFL)
+            server = uvicorn.Server(build_config(self.app, worker_max_requests()))
+            server.run(sockets=[self.sock])
+            if server.started:
+                status = 0
+        except BaseException:
+            logger.exception("Worker %s crashed", os.getpid())
+            if server is not None and server.started:
+                status = 1
+        finally:
+            shutdown_logging()
+            os._exit(status)
+
+    def _on_signal(self, signum, frame) -> None:
+        if signum == signal.SIGHUP:
+            self._reload = True
+        else:
+            self._stopping = True
+
+    def _reap(self) -> list[tuple[int, int]]:
+        exited = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.children.discard(pid)
+            exited.append((pid, os.waitstatus_to_exitcode(status)))
+        return exited
+
+    def _rolling_restart(self) -> None:
+        old = list(self.children)
+        logger.info("Replacing %s workers", len(old))
+        for pid in old:
+            self.spawn()
+            self._signal(pid, signal.SIGTERM)
+
+    def _signal(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            self.children.discard(pid)
+
+    def run(self) -> int:
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, self._on_signal)
+
+        logger.info(
+            "Starting %s workers on %s", self.workers, self.sock.getsockname()
+        )
+        for _ in range(self.workers):
+            self.spawn()
+
+        exit_code = 0
+        while not self._stopping:
+            time.sleep(0.5)
+            if self._reload:
+                self._reload = False
+                self._rolling_restart()
+            for pid, code in self._reap():
+                if code == STARTUP_FAILURE:
+                    logger.error("Worker %s failed to start, shutting down", pid)
+                    self._stopping, exit_code = True, STARTUP_FAILURE
+                    break
+                logger.info("Worker %s exited with %s", pid, code)
+            while not self._stopping and len(self.children) < self.workers:
+                self.spawn()
+
+        self.shutdown()
+        return exit_code
+
+    def shutdown(self) -> None:
+        """SIGTERM every worker, then SIGKILL those still busy after the grace period"""
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + 5
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            logger.warning("Worker %s did not stop in time, killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+        self._reap()
+
+
+def main() -> None:
+    from app.main import app
+
+    workers = worker_count()
+    sock = bind_socket(settings.SERVER_HOST, settings.SERVER_PORT, settings.SERVER_BACKLOG)
+    if workers == 1 and settings.SERVER_MAX_REQUESTS <= 0:
+        # Nothing to supervise: serve from this process
+        uvicorn.Server(build_config(app)).run(sockets=[sock])
+        return
+    sys.exit(Supervisor(app, sock, workers).run())
+
+
+if __name__ == "__main__":
+    main()
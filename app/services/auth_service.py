@@ -1,7 +1,9 @@
+import asyncio
+import uuid
 from typing import Optional, Tuple
 from fastapi import HTTPException, status
 from app.models.user import User
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password_async, password_needs_rehash, verify_password_async
 from app.core.exceptions import (
     UserAlreadyExistsError,
     RegistrationError,
@@ -9,12 +11,20 @@ from app.core.exceptions import (
     UserNotFoundError,
     AuthenticationError
 )
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from app.schemas.user import UserRegistrationRequest
 from sqlalchemy.exc import IntegrityError
 from app.utils.logger import logger
 from .token_service import create_verification_token, verify_registration_token
 from .email_service import EmailService
+from .outbox_service import EmailOutboxService
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Keeps fire-and-forget rehash tasks referenced until they finish
+rehash_tasks: set[asyncio.Task] = set()
 
 
 class AuthService:
@@ -24,7 +34,13 @@ class AuthService:
     ) -> User:
         """
         Create a new user account.
-        
+
+        Taken emails are rejected by an indexed lookup before the password is
+        hashed, so duplicate sign-ups cost no Argon2 work. The insert is one
+        INSERT ... ON CONFLICT (lower(email)) DO NOTHING RETURNING statement,
+        so two concurrent sign-ups for the same email can not both succeed
+        and no refresh is needed.
+
         Returns:
             User: The created user instance.
             
@@ -33,21 +49,25 @@ class AuthService:
             RegistrationError: For other registration failures.
         """
         try:
-            existing_user = await User.fetch_unique(db, email=user_data.email.lower())
-            if existing_user is not None:
+            if await User.fetch_by_email(db, user_data.email) is not None:
                 raise UserAlreadyExistsError("Email already registered")
 
-            new_user = User(
+            new_user = await User.insert_unless_exists(
+                db,
+                [func.lower(User.email)],
+                conflict_where=User.not_deleted(),
                 full_name=user_data.full_name,
-                email=user_data.email.lower(),
+                email=User.normalize_email(user_data.email),
                 email_verified=False,
-                password_hash=hash_password(user_data.password),
+                password_hash=await hash_password_async(user_data.password),
             )
+            if new_user is None:
+                await db.rollback()
+                raise UserAlreadyExistsError("Email already registered")
 
-            new_user.add(db)
-            await db.flush()
+            if settings.EMAIL_DELIVERY_MODE == "outbox":
+                EmailOutboxService.enqueue_verification(db, new_user)
             await db.commit()
-            await db.refresh(new_user)
 
             return new_user
 
@@ -75,7 +95,11 @@ class AuthService:
     async def verify_email(db: AsyncSession, token: str) -> bool:
         """
         Verify user email.
-        
+
+        A single conditional UPDATE ... WHERE email_verified = false
+        RETURNING; the user is only looked up when nothing was updated, to
+        tell an already verified account from a missing one.
+
         Returns:
             bool: True if verification successful (or already verified).
             
@@ -85,16 +109,17 @@ class AuthService:
         """
         try:
             email = verify_registration_token(token)
-            user = await User.fetch_unique(db, email=email)
-            
-            if not user:
-                raise UserNotFoundError("User not found")
-                
-            if user.email_verified:
+            updated = await User.update_returning(
+                db,
+                where={"email_verified": False},
+                values={"email_verified": True},
+                criteria=[User.email_matches(email), User.not_deleted()],
+            )
+            if updated:
                 return True
-                
-            user.email_verified = True
-            await user.update(db)
+
+            if await User.fetch_by_email(db, email) is None:
+                raise UserNotFoundError("User not found")
             return True
             
         except InvalidTokenError:
@@ -118,16 +143,54 @@ class AuthService:
             AuthenticationError: If credentials are invalid.
         """
         try:
-            user = await User.fetch_unique(db, email=email.lower())
+            user = await User.fetch_by_email(db, email)
             if not user:
                 raise AuthenticationError("Incorrect email or password")
                 
-            if not verify_password(password, user.password_hash):
+            if not await verify_password_async(password, user.password_hash):
                 raise AuthenticationError("Incorrect email or password")
-                
+
+            if password_needs_rehash(user.password_hash):
+                AuthService.schedule_rehash(db.bind, user.id, user.password_hash, password)
+
             return user
         except AuthenticationError:
             raise
         except Exception as e:
             logger.error(f"Authentication error: {e}")
             raise AuthenticationError("Authentication failed")
+
+    @staticmethod
+    def schedule_rehash(
+        bind: AsyncEngine, user_id: uuid.UUID, old_hash: str, password: str
+    ) -> asyncio.Task:
+        """
+        Re-hash a password with the current Argon2 parameters in the background.
+
+        Runs after the login response has been sent, on its own session since
+        the request's session will be closed by then. The UPDATE only applies
+        if the stored hash is still the one that was verified, so a password
+        change in the meantime is never overwritten.
+        """
+        task = asyncio.create_task(
+            AuthService._rehash_password(bind, user_id, old_hash, password)
+        )
+        rehash_tasks.add(task)
+        task.add_done_callback(rehash_tasks.discard)
+        return task
+
+    @staticmethod
+    async def _rehash_password(
+        bind: AsyncEngine, user_id: uuid.UUID, old_hash: str, password: str
+    ) -> None:
+        try:
+            new_hash = await hash_password_async(password)
+            async with AsyncSession(bind) as db:
+                await db.execute(
+                    update(User)
+                    .where(User.id == user_id, User.password_hash == old_hash)
+                    .values(password_hash=new_hash)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error("Password rehash failed for user %s: %s", user_id, e)
@@ -1,27 +1,34 @@
 #!/usr/bin/python3
 """Email Service Module"""
 
-from fastapi_mail import FastMail, MessageSchema, MessageType
+from email.message import Message
 from app.core.config import get_settings
-from app.core.mail_config import mail_conf
 from app.models.user import User
+from app.services.email_templates import email_templates
+from app.services.mail_transport import mail_transport
 
 settings = get_settings()
 
 
 class EmailService:
+    @staticmethod
+    def build_verification_message(email: str, full_name: str, token: str) -> Message:
+        """Render the verification email for a recipient"""
+        verification_url = f"{settings.BASE_URI}/api/v1/auth/verify-email?token={token}"
+        rendered = email_templates.render("verification", url=verification_url, name=full_name)
+        return rendered.to_message(settings.MAIL_FROM, email)
+
     @staticmethod
     async def send_verification_email(user: User, token: str):
         """Send verification email to user"""
-        
-        verification_url = f"{settings.BASE_URI}/api/v1/auth/verify-email?token={token}"
-        
-        message = MessageSchema(
-            subject="Confirm your Hotspot Management Account",
-            recipients=[user.email],
-            template_body={"url": verification_url, "name": user.full_name},
-            subtype=MessageType.html,
-        )
-        
-        fm = FastMail(mail_conf)
-        await fm.send_message(message, template_name="verification.html")
+        message = EmailService.build_verification_message(user.email, user.full_name, token)
+        await mail_transport.send(message)
+
+    @staticmethod
+    async def send_verification_emails(batch: list[tuple[User, str]]):
+        """Send verification emails to many users over the pooled transport"""
+        messages = [
+            EmailService.build_verification_message(user.email, user.full_name, token)
+            for user, token in batch
+        ]
+        return await mail_transport.send_many(messages)
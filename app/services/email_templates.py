@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""Compiled email template registry"""
+
+from dataclasses import dataclass
+from email.message import Message
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+    nodes,
+    select_autoescape,
+)
+from markupsafe import escape
+from app.core.config import get_settings
+from app.core.mail_config import mail_conf
+
+settings = get_settings()
+
+# Subject line per email; may use plain {{ name }} substitutions
+SUBJECTS = {
+    "verification": "Confirm your Hotspot Management Account",
+}
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    html: str
+    text: str | None = None
+
+    def to_message(self, sender: str, recipient: str) -> Message:
+        """
+        Build the MIME message for one recipient.
+
+        Uses the compat32 MIME classes: EmailMessage re-parses every header
+        and picks a transfer encoding per part, which costs far more than
+        rendering the template itself.
+        """
+        html = MIMEText(self.html, "html", "utf-8")
+        if self.text is None:
+            message = html
+        else:
+            message = MIMEMultipart("alternative")
+            message.attach(MIMEText(self.text, "plain", "utf-8"))
+            message.attach(html)
+        message["Subject"] = self.subject
+        message["From"] = sender
+        message["To"] = recipient
+        return message
+
+
+class PreparedTemplate:
+    """
+    A template split into its static text and the variables in between.
+
+    Only templates made of plain `{{ name }}` substitutions can be prepared;
+    rendering one is a single join, with the same escaping Jinja applies.
+    """
+
+    __slots__ = ("statics", "names", "autoescape")
+
+    def __init__(self, statics: tuple[str, ...], names: tuple[str, ...], autoescape: bool):
+        self.statics = statics
+        self.names = names
+        self.autoescape = autoescape
+
+    @classmethod
+    def parse(cls, env: Environment, source: str, autoescape: bool) -> "PreparedTemplate | None":
+        """Split `source`, or return None if it needs the full template engine"""
+        statics, names = [""], []
+        for node in env.parse(source).body:
+            if not isinstance(node, nodes.Output):
+                return None
+            for child in node.nodes:
+                if isinstance(child, nodes.TemplateData):
+                    statics[-1] += child.data
+                elif isinstance(child, nodes.Name) and child.name not in env.globals:
+                    names.append(child.name)
+                    statics.append("")
+                else:
+                    return None
+        return cls(tuple(statics), tuple(names), autoescape)
+
+    def render(self, context: dict) -> str:
+        parts = [self.statics[0]]
+        for name, static in zip(self.names, self.statics[1:]):
+            value = context.get(name, "")
+            parts.append(escape(value) if self.autoescape else str(value))
+            parts.append(static)
+        return "".join(parts)
+
+
+@dataclass
+class _CompiledTemplate:
+    template: Template
+    prepared: PreparedTemplate | None
+
+    def render(self, context: dict) -> str:
+        if self.prepared is not None:
+            return self.prepared.render(context)
+        return self.template.render(context)
+
+
+class EmailTemplateRegistry:
+    """
+    Email templates compiled once and kept in memory.
+
+    Each email `name` is `<name>.html` plus an optional `<name>.txt` in
+    `folder`, and a subject from `subjects`. Everything is compiled on
+    `load()` or on first use. With `auto_reload` (DEBUG) the template files
+    are checked for changes on each render and recompiled when edited.
+    """
+
+    def __init__(self, folder: Path, subjects: dict[str, str], auto_reload: bool = False):
+        self.env = Environment(
+            loader=FileSystemLoader(folder),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=auto_reload,
+            cache_size=-1,
+        )
+        self.auto_reload = auto_reload
+        self.subjects = {}
+        for name, subject in subjects.items():
+            prepared = PreparedTemplate.parse(self.env, subject, autoescape=False)
+            if prepared is None:
+                raise ValueError(f"Subject for {name!r} may only substitute variables")
+            self.subjects[name] = prepared
+        self._templates: dict[str, _CompiledTemplate | None] = {}
+        self.compilations = 0
+
+    def load(self) -> None:
+        """Compile every template in the folder"""
+        for filename in self.env.list_templates(extensions=("html", "txt")):
+            self._templates[filename] = self._compile(filename)
+
+    def _compile(self, filename: str) -> _CompiledTemplate:
+        template = self.env.get_template(filename)
+        source, _, _ = self.env.loader.get_source(self.env, filename)
+        autoescape = self.env.autoescape(filename)
+        self.compilations += 1
+        return _CompiledTemplate(
+            template=template,
+            prepared=PreparedTemplate.parse(self.env, source, autoescape),
+        )
+
+    def _get(self, filename: str) -> _CompiledTemplate | None:
+        compiled = self._templates.get(filename)
+        if compiled is not None and not (self.auto_reload and not compiled.template.is_up_to_date):
+            return compiled
+        if compiled is None and filename in self._templates and not self.auto_reload:
+            return None
+        try:
+            compiled = self._compile(filename)
+        except TemplateNotFound:
+            compiled = None
+        self._templates[filename] = compiled
+        return compiled
+
+    def render(self, email: str, /, **context) -> RenderedEmail:
+        """Render the subject, HTML and text parts of `email`"""
+        html = self._get(f"{email}.html")
+        if html is None:
+            raise TemplateNotFound(f"{email}.html")
+        text = self._get(f"{email}.txt")
+        subject = self.subjects.get(email)
+        return RenderedEmail(
+            subject=subject.render(context) if subject else "",
+            html=html.render(context),
+            text=text.render(context) if text else None,
+        )
+
+
+email_templates = EmailTemplateRegistry(
+    mail_conf.TEMPLATE_FOLDER, SUBJECTS, auto_reload=settings.DEBUG
+)
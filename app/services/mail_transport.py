@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""Pooled SMTP transport for outgoing email"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from email.message import Message
+from typing import Iterable
+import aiosmtplib
+from app.core.config import get_settings
+from app.utils.logger import logger
+
+settings = get_settings()
+
+
+@dataclass
+class _PooledConnection:
+    client: aiosmtplib.SMTP
+    last_used: float
+    sent: int = 0
+
+
+class SMTPConnectionPool:
+    """
+    Long-lived SMTP connections shared by every send in the process.
+
+    Connections are opened on demand up to `size`, reused across messages,
+    pinged with NOOP when they have been idle longer than `keepalive`, and
+    replaced when the server drops them. At most `max_pending` sends may be
+    queued or in flight; further callers wait, which pushes back on whoever
+    is producing mail instead of growing an unbounded backlog.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        use_tls: bool = False,
+        start_tls: bool = False,
+        validate_certs: bool = True,
+        size: int = 4,
+        max_pending: int = 1000,
+        keepalive: float = 30.0,
+        max_messages_per_connection: int = 100,
+        timeout: float = 30.0,
+        suppress_send: bool = False,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.validate_certs = validate_certs
+        self.size = size
+        self.max_pending = max_pending
+        self.keepalive = keepalive
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self.suppress_send = suppress_send
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._idle: asyncio.LifoQueue[_PooledConnection] | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._pending: asyncio.Semaphore | None = None
+        self.open_connections = 0
+        self.sent = 0
+        self.failed = 0
+        self.reconnects = 0
+
+    def _bind_loop(self) -> None:
+        # asyncio primitives belong to one loop; rebuild them if it changed
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle = asyncio.LifoQueue()
+            self._slots = asyncio.Semaphore(self.size)
+            self._pending = asyncio.Semaphore(self.max_pending)
+            self.open_connections = 0
+
+    async def _connect(self) -> _PooledConnection:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            validate_certs=self.validate_certs,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username and self.password:
+            await client.login(self.username, self.password)
+        self.open_connections += 1
+        return _PooledConnection(client=client, last_used=time.monotonic())
+
+    async def _discard(self, conn: _PooledConnection) -> None:
+        self.open_connections -= 1
+        try:
+            await conn.client.quit()
+        except Exception:
+            conn.client.close()
+
+    async def _acquire(self) -> _PooledConnection:
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            if not conn.client.is_connected:
+                self.open_connections -= 1
+                continue
+            if time.monotonic() - conn.last_used > self.keepalive:
+                try:
+                    await conn.client.noop()
+                except aiosmtplib.SMTPException:
+                    self.open_connections -= 1
+                    conn.client.close()
+                    continue
+            return conn
+        return await self._connect()
+
+    async def _release(self, conn: _PooledConnection) -> None:
+        conn.last_used = time.monotonic()
+        if conn.sent >= self.max_messages_per_connection:
+            await self._discard(conn)
+        else:
+            self._idle.put_nowait(conn)
+
+    async def send(self, message: Message) -> None:
+        """Send one message, reconnecting once if the server dropped us"""
+        if self.suppress_send:
+            return
+        self._bind_loop()
+        async with self._pending, self._slots:
+            for attempt in range(2):
+                conn = await self._acquire()
+                try:
+                    await conn.client.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    self.open_connections -= 1
+                    conn.client.close()
+                    if attempt:
+                        self.failed += 1
+                        raise
+                    self.reconnects += 1
+                    continue
+                except aiosmtplib.SMTPResponseException:
+                    # The server rejected this message; the session is still usable
+                    self.failed += 1
+                    await self._release(conn)
+                    raise
+                except Exception:
+                    self.failed += 1
+                    await self._discard(conn)
+                    raise
+                conn.sent += 1
+                self.sent += 1
+                await self._release(conn)
+                return
+
+    async def send_many(self, messages: Iterable[Message]) -> list[Exception | None]:
+        """Send a batch concurrently over the pool; returns per-message errors"""
+        results = await asyncio.gather(
+            *(self.send(message) for message in messages), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Failed to send email: %s", result)
+        return [result if isinstance(result, Exception) else None for result in results]
+
+    async def close(self) -> None:
+        """Quit every idle connection"""
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+    def stats(self) -> dict:
+        return {
+            "open_connections": self.open_connections,
+            "idle_connections": self._idle.qsize() if self._idle else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "reconnects": self.reconnects,
+        }
+
+
+mail_transport = SMTPConnectionPool(
+    hostname=settings.MAIL_SERVER,
+    port=settings.MAIL_PORT,
+    username=settings.MAIL_USERNAME if settings.USE_CREDENTIALS else None,
+    password=settings.MAIL_PASSWORD if settings.USE_CREDENTIALS else None,
+    use_tls=settings.MAIL_SSL_TLS,
+    start_tls=settings.MAIL_STARTTLS,
+    validate_certs=settings.VALIDATE_CERTS,
+    size=settings.MAIL_POOL_SIZE,
+    max_pending=settings.MAIL_MAX_PENDING,
+    keepalive=settings.MAIL_KEEPALIVE_SECONDS,
+    suppress_send=bool(settings.SUPPRESS_SEND),
+)
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""Email outbox service module"""
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.models.email_outbox import EmailOutbox
+from app.models.user import User
+from app.utils.datetimes import as_utc
+from app.utils.logger import get_correlation_id
+
+settings = get_settings()
+
+VERIFICATION = "verification"
+
+
+class EmailOutboxService:
+    @staticmethod
+    def enqueue_verification(db: AsyncSession, user: User) -> EmailOutbox:
+        """
+        Queue a verification email in the caller's transaction.
+
+        The job commits or rolls back together with the user row, and the
+        token is minted by the worker when the email is actually sent.
+        """
+        job = EmailOutbox(
+            kind=VERIFICATION,
+            recipient=user.email,
+            payload={"full_name": user.full_name, "request_id": get_correlation_id()},
+        )
+        job.add(db)
+        return job
+
+    @staticmethod
+    async def claim_batch(
+        db: AsyncSession, limit: int
+    ) -> tuple[list[EmailOutbox], datetime | None]:
+        """
+        Claim up to `limit` due jobs.
+
+        Rows are locked with SKIP LOCKED so concurrent workers never pick the
+        same job, then leased by pushing next_attempt_at forward. A worker that
+        dies mid-send leaves the job to be picked up again once the lease ends.
+
+        Returns the jobs and when the oldest of them became due, read before
+        the lease overwrites next_attempt_at; None if nothing was due.
+        """
+        now = datetime.now(timezone.utc)
+        query = (
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == EmailOutbox.PENDING,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list((await db.execute(query)).scalars().all())
+        oldest_due = as_utc(jobs[0].next_attempt_at) if jobs else None
+
+        lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+        for job in jobs:
+            job.attempts += 1
+            job.next_attempt_at = lease_until
+        await db.commit()
+        return jobs, oldest_due
+
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        """Exponential delay before the next attempt, capped"""
+        delay = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** max(0, attempts - 1)
+        return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS))
+
+    @staticmethod
+    def mark_sent(job: EmailOutbox) -> None:
+        job.status = EmailOutbox.SENT
+        job.sent_at = datetime.now(timezone.utc)
+        job.last_error = None
+
+    @staticmethod
+    def mark_failed(job: EmailOutbox, error: Exception) -> None:
+        """Schedule a retry, or dead-letter the job once attempts run out"""
+        job.last_error = f"{type(error).__name__}: {error}"
+        if job.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            job.status = EmailOutbox.DEAD
+        else:
+            job.next_attempt_at = datetime.now(timezone.utc) + EmailOutboxService.backoff(
+                job.attempts
+            )
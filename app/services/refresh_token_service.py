@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""Refresh token service module"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.exceptions import InvalidTokenError
+from app.core.revocation import revocations
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.utils.datetimes import as_utc
+from app.utils.logger import logger
+from .token_service import create_access_token, create_refresh_token, decode_refresh_token
+
+settings = get_settings()
+
+
+class RefreshTokenService:
+    @staticmethod
+    async def issue(db: AsyncSession, user: User, family_id: uuid.UUID | None = None) -> str:
+        """
+        Store and return a new refresh token for `user`.
+
+        A login starts a new family; rotations keep the family of the token
+        they replace so reuse of any old token can revoke the whole chain.
+        """
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+        )
+        row = RefreshToken(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            family_id=family_id or uuid.uuid4(),
+            expires_at=expires_at,
+        )
+        row.add(db)
+        await db.commit()
+        return create_refresh_token(
+            str(row.id), str(user.id), str(row.family_id), expires_at
+        )
+
+    @staticmethod
+    async def rotate(db: AsyncSession, token: str) -> tuple[User, str, str]:
+        """
+        Exchange a refresh token for a new access and refresh token pair.
+
+        The old token is revoked with a conditional UPDATE, so of two
+        requests racing with the same token only one can win. Presenting a
+        token that was already rotated is treated as theft and revokes every
+        token in its family.
+
+        Raises:
+            InvalidTokenError: If the token is invalid, expired or revoked.
+        """
+        claims = decode_refresh_token(token)
+        jti, family_id, expires_at = claims["jti"], claims["fam"], claims["exp"]
+
+        await RefreshTokenService.ensure_revocations_loaded(db)
+        if revocations.is_family_revoked(family_id):
+            raise InvalidTokenError("Refresh token has been revoked")
+        if revocations.is_token_revoked(jti):
+            await RefreshTokenService.revoke_family(db, family_id, expires_at)
+            raise InvalidTokenError("Refresh token has been revoked")
+
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == uuid.UUID(jti),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(RefreshToken.user_id)
+        )
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            # Already rotated, possibly by another worker
+            await db.rollback()
+            await RefreshTokenService.revoke_family(db, family_id, expires_at)
+            raise InvalidTokenError("Refresh token has been revoked")
+        revocations.revoke_token(jti, expires_at)
+
+        user = await db.get(User, user_id)
+        if user is None or not user.is_active or user.is_deleted:
+            await db.commit()
+            raise InvalidTokenError("Refresh token has been revoked")
+
+        refresh_token = await RefreshTokenService.issue(db, user, uuid.UUID(family_id))
+        access_token = create_access_token(data={"sub": user.email})
+        return user, access_token, refresh_token
+
+    @staticmethod
+    async def revoke_family(db: AsyncSession, family_id: str, expires_at: float) -> None:
+        """Revoke every outstanding token in a family"""
+        logger.warning("Refresh token reuse detected, revoking family %s", family_id)
+        await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.family_id == uuid.UUID(family_id),
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        # Later tokens in the family expire at most one lifetime from now
+        horizon = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        revocations.revoke_family(family_id, max(expires_at, horizon.timestamp()))
+
+    @staticmethod
+    async def ensure_revocations_loaded(db: AsyncSession) -> None:
+        """Fill the in-memory revocation set from the database, once"""
+        if revocations.loaded:
+            return
+        now = datetime.now(timezone.utc)
+        rows = await db.execute(
+            select(RefreshToken.id, RefreshToken.expires_at).where(
+                RefreshToken.revoked_at.is_not(None), RefreshToken.expires_at > now
+            )
+        )
+        revocations.load(
+            (str(jti), as_utc(expires_at).timestamp()) for jti, expires_at in rows
+        )
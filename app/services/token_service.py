@@ -2,10 +2,12 @@
 """token service module"""
 
 from datetime import datetime, timedelta, timezone
-from jose import jwt, JWTError
+from jose import JWTError
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from fastapi import HTTPException, status
 from app.core.config import get_settings
+from app.core.exceptions import InvalidTokenError
+from app.core.signing import token_signer
 
 
 settings = get_settings()
@@ -22,9 +24,37 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = token_signer.sign(to_encode)
     return encoded_jwt
 
+def decode_access_token(token: str) -> dict:
+    """Verify an access token and return its claims; raises JWTError"""
+    claims = token_signer.verify(token)
+    if claims.get("type") == "refresh":
+        raise JWTError("Refresh tokens can not be used as access tokens")
+    return claims
+
+def create_refresh_token(jti: str, user_id: str, family_id: str, expires_at: datetime) -> str:
+    """Create JWT refresh token; its jti is the refresh_tokens row id"""
+    to_encode = {
+        "sub": user_id,
+        "jti": jti,
+        "fam": family_id,
+        "type": "refresh",
+        "exp": expires_at,
+    }
+    return token_signer.sign(to_encode)
+
+def decode_refresh_token(token: str) -> dict:
+    """Verify a refresh token's signature and expiry and return its claims"""
+    try:
+        claims = token_signer.verify(token)
+    except JWTError:
+        raise InvalidTokenError("Invalid or expired refresh token")
+    if claims.get("type") != "refresh" or not claims.get("jti") or not claims.get("fam"):
+        raise InvalidTokenError("Invalid or expired refresh token")
+    return claims
+
 def create_verification_token(email:str):
     """create email token"""
     return serializer.dumps(email, salt=settings.SECURITY_SALT)
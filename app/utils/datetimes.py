@@ -0,0 +1,9 @@
+#!/usr/bin/python3
+"""Datetime helpers"""
+
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """Attach UTC to naive datetimes; SQLite hands them back without a zone"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -1,7 +1,14 @@
 #!/usr/bin/python3
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import random
 import sys
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from app.core.config import get_settings
 
@@ -15,6 +22,11 @@ correlation_id_context: ContextVar[Optional[str]] = ContextVar(
     "correlation_id", default=None
 )
 
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime", "correlation_id"}
+
 
 def _resolve_log_level(level: str) -> int:
 
@@ -30,8 +42,111 @@ class CorrelationIdFilter(logging.Filter):
         return True
 
 
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of records for levels with a sample rate below 1."""
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = {_resolve_log_level(level): rate for level, rate in rates.items()}
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+        if rate is None or rate >= 1 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as one JSON object per line, including `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "correlation_id": getattr(record, "correlation_id", "N/A"),
+            "service": SERVICE_NAME,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    When the queue is full the new record is dropped and counted, so a slow
+    stdout can not back up into request handling.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here, where the args are still
+        # valid, and keep the structured extras for the listener's formatter.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    QueueListener whose stop() waits for room to enqueue its sentinel.
+
+    The stdlib enqueues it with put_nowait, which raises queue.Full when the
+    bounded queue is full. The listener thread keeps draining the queue, so
+    a blocking put gets through; if the thread is stuck for longer than
+    SENTINEL_TIMEOUT_SECONDS, stop() gives up and leaves it running.
+    """
+
+    SENTINEL_TIMEOUT_SECONDS = 5.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel, timeout=self.SENTINEL_TIMEOUT_SECONDS)
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        try:
+            self.enqueue_sentinel()
+        except queue.Full:
+            return
+        self._thread.join()
+        self._thread = None
+
+
+_listener: Optional[DrainingQueueListener] = None
+
+
 def setup_logging(level: str = DEFAULT_LOG_LEVEL) -> logging.Logger:
     """Configure structured logging with correlation ID support."""
+    global _listener
 
     logger = logging.getLogger(SERVICE_NAME)
     logger.setLevel(_resolve_log_level(level))
@@ -40,26 +155,64 @@ def setup_logging(level: str = DEFAULT_LOG_LEVEL) -> logging.Logger:
     if logger.handlers:
         return logger
 
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(_resolve_log_level(level))
-
-    formatter = logging.Formatter(
-        (
-            '{"timestamp": "%(asctime)s", "level": "%(levelname)s", '
-            '"correlation_id": "%(correlation_id)s", "service": "'
-            + SERVICE_NAME
-            + '", '
-            '"message": "%(message)s", "module": "%(module)s", "function": "%(funcName)s"}'
-        )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setLevel(_resolve_log_level(level))
+    stream_handler.setFormatter(JsonFormatter())
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+    queue_handler.addFilter(CorrelationIdFilter())
+
+    _listener = DrainingQueueListener(
+        queue_handler.queue, stream_handler, respect_handler_level=True
     )
-    handler.setFormatter(formatter)
-    handler.addFilter(CorrelationIdFilter())
+    _listener.start()
+    atexit.register(shutdown_logging)
 
-    logger.addHandler(handler)
+    logger.addHandler(queue_handler)
 
     return logger
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _pause_listener() -> None:
+    # A thread does not survive fork(); stop it so no lock is held mid-fork
+    if _listener is not None:
+        _listener.stop()
+
+
+def _resume_listener() -> None:
+    if _listener is not None and not _listener.running:
+        _listener.start()
+
+
+os.register_at_fork(
+    before=_pause_listener,
+    after_in_parent=_resume_listener,
+    after_in_child=_resume_listener,
+)
+
+
+def logging_stats() -> dict:
+    """Queue depth, dropped and sampled-out counts for the service logger."""
+    stats = {"queue_depth": 0, "dropped": 0, "sampled_out": 0}
+    for handler in logging.getLogger(SERVICE_NAME).handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            stats["queue_depth"] += handler.queue.qsize()
+            stats["dropped"] += handler.dropped
+            for log_filter in handler.filters:
+                if isinstance(log_filter, SamplingFilter):
+                    stats["sampled_out"] += log_filter.sampled_out
+    return stats
+
+
 logger = setup_logging()
 
 
@@ -86,4 +239,6 @@ __all__ = [
     "set_correlation_id",
     "get_correlation_id",
     "clear_correlation_id",
+    "shutdown_logging",
+    "logging_stats",
 ]
@@ -1,10 +1,29 @@
-from typing import Optional
+from typing import Any, Optional
 
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from starlette.responses import Response
 
 
-def success_response(status_code: int, message: str, data: Optional[dict] = None):
+# Serializes the whole envelope, models inside it included, in pydantic-core
+_envelope = TypeAdapter(Any)
+
+
+class EnvelopeResponse(Response):
+    """
+    JSON response that encodes its content straight to bytes in one pass.
+
+    pydantic-core walks the envelope and any models, UUIDs and datetimes in
+    it and writes the JSON directly, with no intermediate dicts. Values are
+    encoded the way FastAPI encodes response models.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _envelope.dump_json(content)
+
+
+def success_response(status_code: int, message: str, data: Optional[Any] = None):
     """Returns a JSON response for success responses"""
 
     response_data = {
@@ -14,9 +33,7 @@ def success_response(status_code: int, message: str, data: Optional[dict] = None
         "data": data or {},
     }
 
-    return JSONResponse(
-        status_code=status_code, content=jsonable_encoder(response_data)
-    )
+    return EnvelopeResponse(status_code=status_code, content=response_data)
 
 
 def auth_response(
@@ -39,9 +56,7 @@ def auth_response(
         },
     }
 
-    return JSONResponse(
-        status_code=status_code, content=jsonable_encoder(response_data)
-    )
+    return EnvelopeResponse(status_code=status_code, content=response_data)
 
 
 def fail_response(status_code: int, message: str, context: Optional[dict] = None):
@@ -54,9 +69,19 @@ def fail_response(status_code: int, message: str, context: Optional[dict] = None
         "error": context or {},
     }
 
-    return JSONResponse(
-        status_code=status_code, content=jsonable_encoder(response_data)
+    return EnvelopeResponse(status_code=status_code, content=response_data)
+
+
+def rate_limited_response(error):
+    """429 failure response carrying a Retry-After header"""
+
+    response = fail_response(
+        status_code=429,
+        message=error.message,
+        context={"retry_after": error.retry_after},
     )
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
 
 
 def validation_error_response(errors: dict):
@@ -69,4 +94,4 @@ def validation_error_response(errors: dict):
         "errors": errors,
     }
 
-    return JSONResponse(status_code=422, content=jsonable_encoder(response))
+    return EnvelopeResponse(status_code=422, content=response)
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+Email outbox worker.
+
+Runs separately from the API: `python -m app.workers.email_worker`
+"""
+
+import asyncio
+import signal
+import time
+from datetime import datetime, timezone
+from email.message import Message
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.services.email_service import EmailService
+from app.services.email_templates import email_templates
+from app.services.mail_transport import SMTPConnectionPool, mail_transport
+from app.services.outbox_service import VERIFICATION, EmailOutboxService
+from app.services.token_service import create_verification_token
+from app.utils.logger import logger
+
+settings = get_settings()
+
+
+def build_message(job: EmailOutbox) -> Message:
+    """Render the email for an outbox job"""
+    if job.kind == VERIFICATION:
+        token = create_verification_token(job.recipient)
+        return EmailService.build_verification_message(
+            job.recipient, job.payload.get("full_name", ""), token
+        )
+    raise ValueError(f"Unknown email kind: {job.kind}")
+
+
+class EmailOutboxWorker:
+    """Claims outbox jobs in batches and sends them concurrently"""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = SessionLocal,
+        transport: SMTPConnectionPool = mail_transport,
+        batch_size: int = settings.EMAIL_OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.EMAIL_OUTBOX_POLL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.transport = transport
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.started_at = time.monotonic()
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.batches = 0
+        self.lag_seconds = 0.0
+        self._stopping = asyncio.Event()
+
+    async def run_once(self) -> int:
+        """Claim and process one batch; returns the number of jobs handled"""
+        async with self.session_factory() as db:
+            jobs, oldest_due = await EmailOutboxService.claim_batch(db, self.batch_size)
+            if not jobs:
+                self.lag_seconds = 0.0
+                return 0
+
+            self.batches += 1
+            # Measured from when the oldest job became due, so retry backoff is not lag
+            self.lag_seconds = (datetime.now(timezone.utc) - oldest_due).total_seconds()
+
+            messages, ready = [], []
+            for job in jobs:
+                try:
+                    messages.append(build_message(job))
+                    ready.append(job)
+                except Exception as e:
+                    self._record_failure(job, e)
+
+            errors = await self.transport.send_many(messages)
+            for job, error in zip(ready, errors):
+                if error is None:
+                    EmailOutboxService.mark_sent(job)
+                    self.sent += 1
+                else:
+                    self._record_failure(job, error)
+
+            await db.commit()
+            return len(jobs)
+
+    def _record_failure(self, job: EmailOutbox, error: Exception) -> None:
+        EmailOutboxService.mark_failed(job, error)
+        if job.status == EmailOutbox.DEAD:
+            self.dead += 1
+            logger.error(
+                "Dead-lettered email %s to %s: %s",
+                job.id,
+                job.recipient,
+                error,
+                extra={"request_id": job.payload.get("request_id")},
+            )
+        else:
+            self.retried += 1
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+            "batches": self.batches,
+            "throughput_per_second": self.sent / elapsed,
+            "lag_seconds": self.lag_seconds,
+        }
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Poll until stopped, draining full batches back to back"""
+        last_report = time.monotonic()
+        while not self._stopping.is_set():
+            try:
+                handled = await self.run_once()
+            except Exception as e:
+                logger.error("Email worker batch failed: %s", e, exc_info=True)
+                handled = 0
+
+            if time.monotonic() - last_report >= settings.EMAIL_OUTBOX_REPORT_SECONDS:
+                logger.info("Email worker stats", extra=self.stats())
+                last_report = time.monotonic()
+
+            if handled < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        await self.transport.close()
+
+
+async def main() -> None:
+    email_templates.load()
+    worker = EmailOutboxWorker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    logger.info("Email outbox worker started")
+    await worker.run()
+    logger.info("Email outbox worker stopped", extra=worker.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
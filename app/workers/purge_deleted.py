@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Purge job for soft-deleted rows.
+
+Hard-deletes rows soft-deleted more than SOFT_DELETE_RETENTION_DAYS ago,
+PURGE_BATCH_SIZE rows per transaction with a short pause in between, so
+no lock is held for long and replicas keep up. Meant to be run on a
+schedule: `python -m app.workers.purge_deleted`
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.utils.logger import logger
+
+settings = get_settings()
+
+# Models whose soft-deleted rows are purged
+PURGED_MODELS = (User,)
+
+
+async def purge(
+    session_factory: async_sessionmaker = SessionLocal,
+    retention_days: int = settings.SOFT_DELETE_RETENTION_DAYS,
+    batch_size: int = settings.PURGE_BATCH_SIZE,
+    pause: float = settings.PURGE_BATCH_PAUSE_SECONDS,
+) -> dict[str, int]:
+    """Purge every model once; returns the rows removed per table"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    purged = {}
+    async with session_factory() as db:
+        for model in PURGED_MODELS:
+            purged[model.__tablename__] = await model.purge_deleted(
+                db, cutoff, batch_size, pause=pause
+            )
+    return purged
+
+
+async def main() -> None:
+    purged = await purge()
+    logger.info("Purged soft-deleted rows", extra={"purged": purged})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Benchmark BaseModel.bulk_insert against the per-object insert path.
+
+Usage: python -m benchmarks.bench_bulk_insert [--rows 5000] [--chunk-size 1000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.db.base_model import Base
+from app.db.session import build_sessionmaker
+from app.models.user import User
+
+
+def _rows(prefix: str, count: int) -> list[dict]:
+    return [
+        {
+            "email": f"{prefix}{i}@example.com",
+            "full_name": f"Bench User {i}",
+            "password_hash": "x",
+        }
+        for i in range(count)
+    ]
+
+
+async def _per_object(session_factory, rows: list[dict]) -> float:
+    start = time.perf_counter()
+    async with session_factory() as db:
+        for row in rows:
+            await User(**row).insert(db)
+    return time.perf_counter() - start
+
+
+async def _bulk(session_factory, rows: list[dict], chunk_size: int) -> float:
+    start = time.perf_counter()
+    async with session_factory() as db:
+        await User.bulk_insert(db, rows, chunk_size=chunk_size, returning=True)
+    return time.perf_counter() - start
+
+
+async def main(count: int, chunk_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = build_sessionmaker(engine)
+
+        single = await _per_object(session_factory, _rows("single-", count))
+        bulk = await _bulk(session_factory, _rows("bulk-", count), chunk_size)
+        await engine.dispose()
+
+    print(f"rows: {count}, chunk size: {chunk_size}")
+    print(f"per-object insert: {single:.3f}s ({count / single:,.0f} rows/s)")
+    print(f"bulk_insert:       {bulk:.3f}s ({count / bulk:,.0f} rows/s)")
+    print(f"speedup:           {single / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.chunk_size))
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Benchmark of rendering verification emails.
+
+Compares compiling the template for every send (what the fastapi_mail
+TEMPLATE_FOLDER path did), a shared Jinja Environment that checks the file
+on each lookup, and the precompiled EmailTemplateRegistry. Reports wall time
+for rendering N messages and for building the full MIME message.
+
+Usage: python -m benchmarks.bench_email_templates [--messages 10000]
+"""
+
+import argparse
+import time
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from app.core.mail_config import mail_conf
+from app.services.email_service import EmailService
+from app.services.email_templates import email_templates
+
+URL = "http://localhost:8000/api/v1/auth/verify-email?token="
+
+
+def _env() -> Environment:
+    return Environment(
+        loader=FileSystemLoader(mail_conf.TEMPLATE_FOLDER),
+        autoescape=select_autoescape(["html"]),
+    )
+
+
+def compile_per_send(i: int) -> str:
+    return _env().get_template("verification.html").render(url=f"{URL}{i}", name="User")
+
+
+shared = _env()
+
+
+def shared_environment(i: int) -> str:
+    return shared.get_template("verification.html").render(url=f"{URL}{i}", name="User")
+
+
+def registry(i: int) -> str:
+    return email_templates.render("verification", url=f"{URL}{i}", name="User").html
+
+
+def build_message(i: int):
+    return EmailService.build_verification_message(f"user{i}@example.com", "User", str(i))
+
+
+def _time(fn, messages: int) -> float:
+    start = time.perf_counter()
+    for i in range(messages):
+        fn(i)
+    return time.perf_counter() - start
+
+
+def main(messages: int) -> None:
+    email_templates.load()
+    assert compile_per_send(1) == shared_environment(1) == registry(1)
+
+    baseline = None
+    for label, fn in (
+        ("compile per send", compile_per_send),
+        ("shared environment", shared_environment),
+        ("template registry", registry),
+        ("registry + MIME message", build_message),
+    ):
+        elapsed = _time(fn, messages)
+        baseline = baseline or elapsed
+        print(
+            f"{label:<24} {elapsed * 1e3:8.1f} ms  "
+            f"{elapsed / messages * 1e6:7.1f} us/msg  {baseline / elapsed:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=10000)
+    main(parser.parse_args().messages)
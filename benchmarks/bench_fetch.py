@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Micro-benchmark of BaseModel.fetch_unique(email=...) against building
+select(User).filter_by(email=...) for every call, as it did before.
+
+Runs against an in-process SQLite database so the per-lookup time is
+almost entirely Python: statement construction, cache key generation,
+ORM execution and result processing.
+
+Usage: python -m benchmarks.bench_fetch [--lookups 20000] [--users 100]
+"""
+
+import argparse
+import asyncio
+import time
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.db.base_model import Base
+from app.db.session import build_sessionmaker
+from app.models.user import User
+
+
+async def _rebuilt(db, email: str):
+    result = await db.execute(select(User).filter_by(email=email))
+    return result.scalars().one_or_none()
+
+
+async def _cached(db, email: str):
+    return await User.fetch_unique(db, email=email)
+
+
+async def _time(lookup, session_factory, emails: list[str]) -> float:
+    async with session_factory() as db:
+        # Warm the compiled cache so both paths start from the same state
+        await lookup(db, emails[0])
+        start = time.perf_counter()
+        for email in emails:
+            assert await lookup(db, email) is not None
+        return time.perf_counter() - start
+
+
+async def main(lookups: int, users: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = build_sessionmaker(engine)
+    async with session_factory() as db:
+        await User.bulk_insert(
+            db,
+            [
+                {"email": f"user{i}@example.com", "full_name": "Bench User", "password_hash": "x"}
+                for i in range(users)
+            ],
+        )
+
+    emails = [f"user{i % users}@example.com" for i in range(lookups)]
+    rebuilt = await _time(_rebuilt, session_factory, emails)
+    cached = await _time(_cached, session_factory, emails)
+    await engine.dispose()
+
+    print(f"lookups: {lookups}")
+    print(f"select().filter_by() per call: {rebuilt / lookups * 1e6:7.1f} us/lookup")
+    print(f"cached bound select:           {cached / lookups * 1e6:7.1f} us/lookup")
+    print(f"speedup:                       {rebuilt / cached:7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.lookups, args.users))
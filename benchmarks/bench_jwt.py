@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Benchmark of access token signing and verification.
+
+Compares the previous path (python-jose with the secret and algorithm
+passed on every call) against TokenSigner with a pre-built HS256 key and
+with an ES256 key pair. Reports operations per second.
+
+Usage: python -m benchmarks.bench_jwt [--iterations 5000]
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from jose import jwt
+from app.core.config import get_settings
+from app.core.signing import TokenSigner, generate_private_key_pem, load_key_dir
+
+settings = get_settings()
+
+
+def _claims() -> dict:
+    return {
+        "sub": "lex.lee@example.com",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+    }
+
+
+def _ops_per_second(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations: int) -> None:
+    claims = _claims()
+    with tempfile.TemporaryDirectory() as key_dir:
+        with open(f"{key_dir}/bench.pem", "w") as f:
+            f.write(generate_private_key_pem())
+        private_keys, _ = load_key_dir(key_dir)
+        es256 = TokenSigner("ES256", private_keys=private_keys, active_kid="bench")
+    hs256 = TokenSigner("HS256", secret=settings.SECRET_KEY)
+
+    legacy_token = jwt.encode(claims, settings.SECRET_KEY, algorithm="HS256")
+    hs_token = hs256.sign(claims)
+    es_token = es256.sign(claims)
+
+    rows = (
+        (
+            "legacy HS256",
+            lambda: jwt.encode(claims, settings.SECRET_KEY, algorithm="HS256"),
+            lambda: jwt.decode(legacy_token, settings.SECRET_KEY, algorithms=["HS256"]),
+        ),
+        ("cached HS256", lambda: hs256.sign(claims), lambda: hs256.verify(hs_token)),
+        ("cached ES256", lambda: es256.sign(claims), lambda: es256.verify(es_token)),
+    )
+    for label, sign, verify in rows:
+        print(
+            f"{label:<14} sign {_ops_per_second(sign, iterations):9.0f}/s  "
+            f"verify {_ops_per_second(verify, iterations):9.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    main(parser.parse_args().iterations)
@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+"""
+Benchmark of the middleware pipeline.
+
+Rebuilds the app with the middleware from app.main.build_middleware()
+added one layer at a time (with metrics and gzip switched on so every
+layer is present) and reports requests per second for /health and
+/api/v1/auth/me. Requests are driven straight through the ASGI callable,
+so the numbers contain no HTTP client or socket overhead. /auth/me is
+served from a warm principal cache and never touches the database.
+
+The last row adds a no-op BaseHTTPMiddleware on top, for reference.
+
+Usage: python -m benchmarks.bench_middleware [--iterations 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.principal_cache import UserSnapshot, principal_cache
+from app.middleware.pipeline import MiddlewarePipeline
+from app.services.token_service import create_access_token, decode_access_token
+from app.utils import logger as logger_module
+from app import main
+
+settings = get_settings()
+
+PATHS = ("/health", "/api/v1/auth/me")
+
+
+class NoopBaseHTTPMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def _warm_principal_cache() -> str:
+    token = create_access_token(data={"sub": "lex.lee@example.com"})
+    snapshot = UserSnapshot(
+        id=uuid.uuid4(),
+        email="lex.lee@example.com",
+        full_name="Lex Lee",
+        role="user",
+        is_active=True,
+        email_verified=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    principal_cache.set(token, decode_access_token(token), snapshot)
+    return token
+
+
+def _scope(path: str, token: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"origin", b"http://localhost:3000"),
+            (b"accept-encoding", b"gzip"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def _requests_per_second(app, scope: dict, iterations: int) -> float:
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await app(dict(scope), receive, send)
+    if statuses[0] != 200:
+        raise RuntimeError(f"{scope['path']} returned {statuses[0]}")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return iterations / (time.perf_counter() - start)
+
+
+def _build_app(pipeline: MiddlewarePipeline) -> FastAPI:
+    app = FastAPI(routes=main.app.routes)
+    pipeline.install(app)
+    return app
+
+
+async def run(iterations: int) -> None:
+    settings.METRICS_ENABLED = True
+    settings.GZIP_MINIMUM_SIZE = 500
+    metrics.enabled = True
+    full = list(main.build_middleware())
+    token = _warm_principal_cache()
+
+    rows = [("no middleware", MiddlewarePipeline())]
+    for count in range(1, len(full) + 1):
+        rows.append((f"+ {full[count - 1].name}", MiddlewarePipeline(full[:count])))
+    reference = MiddlewarePipeline(full)
+    reference.add("base_http", NoopBaseHTTPMiddleware)
+    rows.append(("+ noop BaseHTTPMiddleware", reference))
+
+    print(f"{'stack':<28}" + "".join(f"{path:>20}" for path in PATHS))
+    for label, pipeline in rows:
+        app = _build_app(pipeline)
+        results = [
+            await _requests_per_second(app, _scope(path, token), iterations) for path in PATHS
+        ]
+        print(f"{label:<28}" + "".join(f"{rps:>18.0f}/s" for rps in results))
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Keep the per-request log lines out of the report
+    with open(os.devnull, "w") as devnull:
+        for handler in logger_module._listener.handlers:
+            handler.setStream(devnull)
+        asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""
+Load benchmark of POST /api/v1/auth/register through an in-process ASGI client.
+
+Compares the previous write path (SELECT existence check, INSERT, COMMIT,
+refresh SELECT) with the single INSERT ... ON CONFLICT DO NOTHING
+RETURNING used by AuthService.register_user. Argon2 is swapped for its
+cheapest parameters so the numbers reflect the database path rather than
+password hashing. Reports registrations per second and the statements
+each registration sent.
+
+SQLite has no network round trips, so on PostgreSQL the gap per removed
+statement is larger than shown here.
+
+Usage: python -m benchmarks.bench_registration [--requests 500] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core import security
+from app.core.exceptions import RegistrationError, UserAlreadyExistsError
+from app.core.rate_limit import login_limiter
+from app.db.base_model import Base
+from app.db.session import build_sessionmaker, get_db
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.outbox_service import EmailOutboxService
+from app.utils import logger as logger_module
+from app.main import app
+
+
+async def legacy_register_user(db, user_data) -> User:
+    """The registration write path before the single-statement insert"""
+    try:
+        existing_user = await User.fetch_unique(db, email=user_data.email.lower())
+        if existing_user is not None:
+            raise UserAlreadyExistsError("Email already registered")
+        new_user = User(
+            full_name=user_data.full_name,
+            email=user_data.email.lower(),
+            email_verified=False,
+            password_hash=await security.hash_password_async(user_data.password),
+        )
+        new_user.add(db)
+        EmailOutboxService.enqueue_verification(db, new_user)
+        await db.flush()
+        await db.commit()
+        await db.refresh(new_user)
+        return new_user
+    except UserAlreadyExistsError:
+        raise
+    except IntegrityError:
+        await db.rollback()
+        raise UserAlreadyExistsError("User already exists")
+    except Exception:
+        await db.rollback()
+        raise RegistrationError("An error occurred while creating the account")
+
+
+async def _run(label: str, prefix: str, requests: int, concurrency: int, statements: list) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    failures = 0
+
+    async def client_loop(ac: AsyncClient):
+        nonlocal failures
+        while not queue.empty():
+            i = queue.get_nowait()
+            response = await ac.post(
+                "/api/v1/auth/register",
+                json={
+                    "email": f"{prefix}{i}@example.com",
+                    "full_name": "Bench User",
+                    "password": "StrongPassword123!",
+                    "confirm_password": "StrongPassword123!",
+                },
+            )
+            if response.status_code != 201:
+                failures += 1
+
+    statements.clear()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as ac:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(ac) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    print(
+        f"{label:<26} {requests / elapsed:8.0f} registrations/s  "
+        f"{len(statements) / requests:4.1f} statements each  failures={failures}"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    security.pwd_context = security.build_pwd_context(1, 8, 1)
+    login_limiter.enabled = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _no_fsync(dbapi_connection, connection_record):
+            # Leave disk flushes out of a benchmark about statement count
+            dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = build_sessionmaker(engine)
+
+        statements: list[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        async def _get_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = _get_db
+        current = AuthService.register_user
+        try:
+            AuthService.register_user = staticmethod(legacy_register_user)
+            await _run("check + insert + refresh", "legacy-", requests, concurrency, statements)
+            AuthService.register_user = current
+            await _run("insert ... on conflict", "single-", requests, concurrency, statements)
+        finally:
+            AuthService.register_user = current
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    # Keep the per-request log lines out of the report
+    with open(os.devnull, "w") as devnull:
+        for handler in logger_module._listener.handlers:
+            handler.setStream(devnull)
+        asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Micro-benchmark of response envelope encoding for /auth/me and /auth/register.
+
+Compares the previous path (model_dump -> jsonable_encoder -> JSONResponse)
+with the single-pass EnvelopeResponse used by the helpers in
+app.utils.responses. Reports CPU time per response.
+
+Usage: python -m benchmarks.bench_responses [--iterations 20000]
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.schemas.user import UserRegistrationResponse
+from app.utils.responses import success_response
+
+PAYLOADS = {
+    "/auth/me": (200, "User profile retrieved"),
+    "/auth/register": (
+        201,
+        "Welcome to Hotspot! Your account has been created successfully.",
+    ),
+}
+
+
+def _user() -> UserRegistrationResponse:
+    return UserRegistrationResponse(
+        id=str(uuid.uuid4()),
+        full_name="Lex Lee",
+        email="lex.lee@example.com",
+        email_verified=False,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _legacy(status_code: int, message: str, user: UserRegistrationResponse):
+    response_data = {
+        "status": "success",
+        "status_code": status_code,
+        "message": message,
+        "data": user.model_dump(),
+    }
+    return JSONResponse(status_code=status_code, content=jsonable_encoder(response_data))
+
+
+def _fast(status_code: int, message: str, user: UserRegistrationResponse):
+    return success_response(status_code=status_code, message=message, data=user)
+
+
+def _decoded(response) -> dict:
+    # The envelope writes UTC as "Z" where isoformat() wrote "+00:00"
+    body = json.loads(response.body)
+    created_at = body["data"]["created_at"]
+    body["data"]["created_at"] = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    return body
+
+
+def _cpu_per_call(fn, iterations: int, *args) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(*args)
+    return (time.process_time() - start) / iterations
+
+
+def main(iterations: int) -> None:
+    user = _user()
+    for route, (status_code, message) in PAYLOADS.items():
+        assert _decoded(_legacy(status_code, message, user)) == _decoded(
+            _fast(status_code, message, user)
+        )
+        legacy = _cpu_per_call(_legacy, iterations, status_code, message, user)
+        fast = _cpu_per_call(_fast, iterations, status_code, message, user)
+        print(
+            f"{route:<16} legacy {legacy * 1e6:7.1f} us  "
+            f"envelope {fast * 1e6:7.1f} us  speedup {legacy / fast:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
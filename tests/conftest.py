@@ -16,8 +16,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ["SUPPRESS_SEND"] = "1"
 
 from app.main import app
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.db.base_model import Base
+from app.core.rate_limit import login_limiter
 
 DATABASE_URI = "sqlite+aiosqlite:///:memory:"
 
@@ -52,6 +53,12 @@ async def init_test_db(event_loop):
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start every test with empty login rate limit counters."""
+    login_limiter.backend.clear()
+
+
 @pytest.fixture
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Provide a clean session and rollback after each test."""
@@ -68,6 +75,7 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_read_db] = _get_test_db
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
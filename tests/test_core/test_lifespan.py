@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Test startup warmup and shutdown draining"""
+
+import asyncio
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import lifespan as lifespan_module
+from app.core.config import get_settings
+from app.db.pool import InstrumentedAsyncQueuePool, get_pool_stats, warm_pool
+from app.services.auth_service import rehash_tasks
+from tests.conftest import SessionLocal
+
+settings = get_settings()
+
+
+def _engine(tmp_path, pool_size: int = 3):
+    return create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_opens_up_to_pool_size(tmp_path):
+    """Test warmup leaves pinged connections idle in the pool"""
+    test_engine = _engine(tmp_path)
+    try:
+        assert await warm_pool(test_engine, 5) == 3
+        stats = get_pool_stats(test_engine)
+        assert stats["checked_in"] == 3
+        assert stats["checked_out"] == 0
+    finally:
+        await test_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_times_phases_and_drains_tasks(tmp_path, monkeypatch):
+    """Test every phase is reported and stuck background tasks are cancelled"""
+    test_engine = _engine(tmp_path)
+    monkeypatch.setattr(lifespan_module, "engine", test_engine)
+    monkeypatch.setattr(lifespan_module, "replica_engines", [])
+    monkeypatch.setattr(lifespan_module, "SessionLocal", SessionLocal)
+    monkeypatch.setattr(settings, "SHUTDOWN_DRAIN_SECONDS", 0.05)
+
+    test_app = FastAPI()
+    async with lifespan_module.lifespan(test_app):
+        assert set(test_app.state.startup_timings) == {
+            "database",
+            "password_hasher",
+            "token_signer",
+            "schemas",
+            "email_templates",
+            "revocations",
+        }
+        assert get_pool_stats(test_engine)["checked_in"] == settings.DB_POOL_MIN_CONNECTIONS
+
+        stuck = asyncio.create_task(asyncio.sleep(10))
+        rehash_tasks.add(stuck)
+        stuck.add_done_callback(rehash_tasks.discard)
+
+    await asyncio.sleep(0)
+    assert stuck.cancelled()
+    assert get_pool_stats(test_engine)["checked_in"] == 0
+
+
+@pytest.mark.asyncio
+async def test_optional_phase_failure_does_not_abort_startup():
+    """Test a failing database phase is logged and timed, not raised"""
+    timer = lifespan_module.PhaseTimer("Startup")
+
+    async def unreachable():
+        raise ConnectionRefusedError("database is down")
+
+    await timer.run("database", unreachable, required=False)
+    assert "database" in timer.timings
+    with pytest.raises(ConnectionRefusedError):
+        await timer.run("database", unreachable)
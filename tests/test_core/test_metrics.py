@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""Test Prometheus metrics and the request metrics middleware"""
+
+import asyncio
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    http_request_db_queries,
+    http_request_duration,
+    instrument_engine,
+    metrics,
+    timed,
+)
+from app.middleware.metrics import MetricsMiddleware
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test bucket counts are cumulative and end with +Inf"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+
+    body = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in body
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in body
+    assert 'latency_seconds_count{route="/a"} 3' in body
+    assert 'latency_seconds_sum{route="/a"} 5.55' in body
+
+
+def test_counter_and_collectors_render():
+    """Test counters escape label values and collectors become gauges"""
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", ("kind",))
+    counter.inc('say "hi"')
+    counter.inc('say "hi"', amount=2)
+    registry.register_collector("pool", lambda: {"size": 5, "enabled": True, "name": "x"})
+
+    body = registry.render()
+    assert 'events_total{kind="say \\"hi\\""} 3' in body
+    assert "pool_size 5" in body
+    assert "pool_enabled" not in body
+    assert "pool_name" not in body
+
+
+def test_timed_is_noop_when_disabled(monkeypatch):
+    """Test nothing is observed while metrics are disabled"""
+    histogram = Histogram("noop_seconds", "No-op")
+    monkeypatch.setattr(metrics, "enabled", False)
+    with timed(histogram, "x"):
+        pass
+    assert histogram.render()[2:] == []
+
+    monkeypatch.setattr(metrics, "enabled", True)
+    with timed(histogram, "x"):
+        pass
+    assert histogram.render()[-1] == "noop_seconds_count 1"
+
+
+def _series_count(histogram: Histogram, *labels) -> int:
+    series = histogram._series.get(labels)
+    return sum(series[0]) if series else 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_records_route_template_and_db_queries(monkeypatch, tmp_path):
+    """Test requests are labelled by route template and count their queries"""
+    monkeypatch.setattr(metrics, "enabled", True)
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(test_engine)
+
+    test_app = FastAPI()
+    test_app.add_middleware(MetricsMiddleware)
+
+    @test_app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        async with test_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    route = "/items/{item_id}"
+    before = _series_count(http_request_duration, "GET", route, "200")
+    try:
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as ac:
+            await ac.get("/items/1")
+            await ac.get("/items/2")
+    finally:
+        await test_engine.dispose()
+
+    assert _series_count(http_request_duration, "GET", route, "200") == before + 2
+    counts, _ = http_request_db_queries._series[("GET", route)]
+    # Both requests issued exactly two queries: the "<= 2" bucket
+    two_bucket = http_request_db_queries.buckets.index(2)
+    assert counts[two_bucket] >= 2
+
+
+@pytest.mark.asyncio
+async def test_middleware_excludes_background_tasks(monkeypatch):
+    """Test latency stops at the response, not after background work"""
+    monkeypatch.setattr(metrics, "enabled", True)
+    test_app = FastAPI()
+    test_app.add_middleware(MetricsMiddleware)
+
+    async def slow_task():
+        await asyncio.sleep(0.3)
+
+    @test_app.get("/with-task")
+    async def with_task(background_tasks: BackgroundTasks):
+        background_tasks.add_task(slow_task)
+        return {"ok": True}
+
+    async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as ac:
+        await ac.get("/with-task")
+
+    _, total = http_request_duration._series[("GET", "/with-task", "200")]
+    assert total < 0.3
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""Test the ordered middleware pipeline"""
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.main import app, middleware
+from app.middleware.pipeline import MiddlewarePipeline, SkipPaths
+from app.middleware.request_id import RequestIdMiddleware
+
+
+def _tagging_middleware(calls: list):
+    class Tag:
+        def __init__(self, app, tag: str):
+            self.app = app
+            self.tag = tag
+
+        async def __call__(self, scope, receive, send):
+            if scope["type"] == "http":
+                calls.append(self.tag)
+            await self.app(scope, receive, send)
+
+    return Tag
+
+
+def _app() -> FastAPI:
+    test_app = FastAPI()
+
+    @test_app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @test_app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    return test_app
+
+
+async def _get(test_app, path: str) -> int:
+    async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as ac:
+        return (await ac.get(path)).status_code
+
+
+@pytest.mark.asyncio
+async def test_middleware_runs_outermost_first():
+    """Test layers run in the order they were added"""
+    calls = []
+    Tag = _tagging_middleware(calls)
+    pipeline = MiddlewarePipeline()
+    pipeline.add("first", Tag, tag="first")
+    pipeline.add("second", Tag, tag="second")
+    pipeline.add("third", Tag, tag="third")
+
+    test_app = _app()
+    pipeline.install(test_app)
+    assert await _get(test_app, "/items/1") == 200
+    assert calls == ["first", "second", "third"]
+
+    calls.clear()
+    assert await _get(pipeline.wrap(_app()), "/items/1") == 200
+    assert calls == ["first", "second", "third"]
+
+
+@pytest.mark.asyncio
+async def test_skipped_paths_bypass_only_that_middleware():
+    """Test per-route opt-out by exact path and by prefix"""
+    calls = []
+    Tag = _tagging_middleware(calls)
+    pipeline = MiddlewarePipeline()
+    pipeline.add("outer", Tag, tag="outer")
+    pipeline.add("inner", Tag, skip_prefixes=("/items/",), tag="inner")
+    pipeline.skip("outer", "/health")
+
+    test_app = _app()
+    pipeline.install(test_app)
+    await _get(test_app, "/health")
+    assert calls == ["inner"]
+
+    calls.clear()
+    await _get(test_app, "/items/1")
+    assert calls == ["outer"]
+
+
+def test_pipeline_rejects_duplicates_and_unknown_names():
+    """Test names are unique and skip() targets a registered layer"""
+    pipeline = MiddlewarePipeline()
+    pipeline.add("request_id", RequestIdMiddleware)
+    with pytest.raises(ValueError):
+        pipeline.add("request_id", RequestIdMiddleware)
+    with pytest.raises(KeyError):
+        pipeline.skip("metrics", "/metrics")
+
+
+def test_app_installs_request_id_outermost():
+    """Test the application stack matches its pipeline"""
+    assert middleware.names[0] == "request_id"
+    assert middleware.names[-1] == "cors"
+    assert len(app.user_middleware) == len(middleware)
+    outermost = app.user_middleware[0]
+    assert outermost.cls in (RequestIdMiddleware, SkipPaths)
@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+"""Test the bounded password hashing pool"""
+
+import asyncio
+import threading
+import time
+import pytest
+from app.core import security
+from app.core.calibrate_argon2 import calibrate
+from app.core.metrics import metrics, password_hash_duration
+from app.core.security import (
+    PasswordHasherPool,
+    build_pwd_context,
+    hash_password,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password,
+    verify_password_async,
+)
+
+
+def _slow_echo(value):
+    time.sleep(0.05)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    """Test async variants round trip through Argon2"""
+    hashed = await hash_password_async("StrongPassword123!")
+    assert hashed.startswith("$argon2")
+    assert await verify_password_async("StrongPassword123!", hashed) is True
+    assert await verify_password_async("WrongPassword", hashed) is False
+
+
+def _observed(operation: str) -> int:
+    series = password_hash_duration._series.get((operation,))
+    return sum(series[0]) if series else 0
+
+
+@pytest.mark.asyncio
+async def test_process_pool_hashes_and_records_timings(monkeypatch):
+    """Test process mode round trips and times each job in the parent"""
+    pool = PasswordHasherPool(workers=2, kind="process")
+    monkeypatch.setattr(security, "hasher_pool", pool)
+    monkeypatch.setattr(metrics, "enabled", True)
+    hashes, verifies = _observed("hash"), _observed("verify")
+    try:
+        hashed = await hash_password_async("StrongPassword123!")
+        assert hashed.startswith("$argon2")
+        assert await verify_password_async("StrongPassword123!", hashed) is True
+        assert await verify_password_async("WrongPassword", hashed) is False
+    finally:
+        pool.shutdown()
+
+    assert pool.stats()["completed"] == 3
+    assert _observed("hash") == hashes + 1
+    assert _observed("verify") == verifies + 2
+
+
+@pytest.mark.asyncio
+async def test_pool_caps_concurrency_and_reports_queue_depth():
+    """Test that jobs beyond the worker count are queued and counted"""
+    pool = PasswordHasherPool(workers=2)
+    try:
+        tasks = [asyncio.create_task(pool.run(_slow_echo, i)) for i in range(6)]
+        await asyncio.sleep(0.01)
+
+        stats = pool.stats()
+        assert stats["in_flight"] == 2
+        assert stats["queue_depth"] == 4
+
+        assert await asyncio.gather(*tasks) == list(range(6))
+        stats = pool.stats()
+        assert stats["completed"] == 6
+        assert stats["queue_depth"] == 0
+        assert stats["peak_pending"] == 6
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_does_not_block_event_loop():
+    """Test that the loop keeps ticking while a hash is computed"""
+    pool = PasswordHasherPool(workers=1)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        await pool.run(_slow_echo, "done")
+    finally:
+        beat.cancel()
+        pool.shutdown()
+    assert ticks > 3
+
+
+@pytest.mark.asyncio
+async def test_start_runs_one_job_on_every_thread():
+    """Test start brings up all workers even when the job is instant"""
+    pool = PasswordHasherPool(workers=4)
+    seen = set()
+    try:
+        await pool.start(lambda: seen.add(threading.get_ident()))
+        assert len(seen) == 4
+        assert pool.stats()["completed"] == 4
+    finally:
+        pool.shutdown()
+
+
+def test_pool_rejects_invalid_configuration():
+    """Test invalid pool settings fail fast"""
+    with pytest.raises(ValueError):
+        PasswordHasherPool(workers=0)
+    with pytest.raises(ValueError):
+        PasswordHasherPool(workers=1, kind="fiber")
+
+
+def test_needs_rehash_when_parameters_change():
+    """Test hashes made with other Argon2 parameters are flagged for upgrade"""
+    cheap = build_pwd_context(time_cost=1, memory_cost=1024, parallelism=1)
+    old_hash = cheap.hash("Password123!")
+    assert password_needs_rehash(old_hash)
+    assert verify_password("Password123!", old_hash)
+    assert not password_needs_rehash(hash_password("Password123!"))
+
+
+def test_calibration_proposes_parameters_within_target():
+    time_cost, memory_cost, parallelism, measured = calibrate(
+        target_ms=50, parallelism=1, max_memory_mib=8, min_memory_mib=1, min_time_cost=1, samples=1
+    )
+    assert time_cost >= 1 and parallelism == 1
+    assert 1024 <= memory_cost <= 8 * 1024
+    assert measured <= 50 or (time_cost == 1 and memory_cost == 1024)
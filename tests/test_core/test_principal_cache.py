@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+"""Test the verified-token principal cache"""
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+import pytest
+from httpx import AsyncClient
+from app.core.exceptions import AuthenticationError
+from app.core.principal_cache import PrincipalCache, UserSnapshot, principal_cache
+from app.core.security import hash_password
+from app.models.user import User
+from app.services.token_service import create_access_token
+
+
+def _snapshot(**overrides) -> UserSnapshot:
+    fields = {
+        "id": uuid.uuid4(),
+        "email": "cache@example.com",
+        "full_name": "Cache User",
+        "role": "user",
+        "is_active": True,
+        "email_verified": True,
+        "created_at": datetime.now(timezone.utc),
+    }
+    fields.update(overrides)
+    return UserSnapshot(**fields)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entry_expires_at_token_exp_before_ttl():
+    """Test that an entry is never served past the token's exp"""
+    clock = FakeClock()
+    cache = PrincipalCache(max_size=10, ttl_seconds=300, clock=clock)
+    cache.set("token", {"sub": "a", "exp": clock.now + 5}, _snapshot())
+
+    assert cache.get("token") is not None
+    clock.now += 6
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_expires_at_ttl():
+    """Test that the TTL caps entries with long-lived tokens"""
+    clock = FakeClock()
+    cache = PrincipalCache(max_size=10, ttl_seconds=30, clock=clock)
+    cache.set("token", {"sub": "a", "exp": clock.now + 3600}, _snapshot())
+
+    clock.now += 31
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test LRU eviction once the cache is full"""
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    cache.set("first", {}, _snapshot())
+    cache.set("second", {}, _snapshot())
+    cache.get("first")
+    cache.set("third", {}, _snapshot())
+
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+    assert cache.get("third") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_user_drops_all_their_tokens():
+    """Test explicit invalidation by user id"""
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    user = _snapshot()
+    other = _snapshot(email="other@example.com")
+    cache.set("token-1", {}, user)
+    cache.set("token-2", {}, user)
+    cache.set("token-3", {}, other)
+
+    cache.invalidate_user(user.id)
+
+    assert cache.get("token-1") is None
+    assert cache.get("token-2") is None
+    assert cache.get("token-3") is not None
+
+
+@pytest.mark.asyncio
+async def test_me_skips_user_lookup_on_cache_hit(client: AsyncClient, db_session):
+    """Test that repeat requests with the same token do not query the user"""
+    user = User(
+        full_name="Cached User",
+        email="cached@example.com",
+        email_verified=True,
+        password_hash=hash_password("StrongPassword123!"),
+    )
+    user.add(db_session)
+    await db_session.commit()
+
+    token = create_access_token(data={"sub": user.email})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with patch.object(User, "fetch_by_email", wraps=User.fetch_by_email) as fetch:
+        first = await client.get("/api/v1/auth/me", headers=headers)
+        second = await client.get("/api/v1/auth/me", headers=headers)
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert fetch.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_user_update_invalidates_cached_principal(client: AsyncClient, db_session):
+    """Test that changing role through User.update drops cached tokens"""
+    user = User(
+        full_name="Role User",
+        email="role@example.com",
+        email_verified=True,
+        password_hash=hash_password("StrongPassword123!"),
+    )
+    user.add(db_session)
+    await db_session.commit()
+
+    token = create_access_token(data={"sub": user.email})
+    response = await client.get(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert principal_cache.get(token) is not None
+
+    await user.update(db_session, role="admin")
+
+    assert principal_cache.get(token) is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_invalidates_cached_principal(client: AsyncClient, db_session):
+    """Test that a role changed through User.bulk_update is reloaded on the next request"""
+    user = User(
+        full_name="Bulk Role User",
+        email="bulk-role@example.com",
+        email_verified=True,
+        password_hash=hash_password("StrongPassword123!"),
+    )
+    user.add(db_session)
+    await db_session.commit()
+
+    token = create_access_token(data={"sub": user.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    with patch.object(User, "fetch_by_email", wraps=User.fetch_by_email) as fetch:
+        assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+        assert principal_cache.get(token)[1].role == "user"
+
+        await User.bulk_update(db_session, [{"id": user.id, "role": "admin"}])
+        assert principal_cache.get(token) is None
+
+        assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+    assert fetch.call_count == 2
+    assert principal_cache.get(token)[1].role == "admin"
+
+
+@pytest.mark.asyncio
+async def test_assigned_fields_saved_by_update_invalidate_cached_principal(
+    client: AsyncClient, db_session
+):
+    """Test that attributes set before a bare User.update are seen by the next request"""
+    user = User(
+        full_name="Assigned User",
+        email="assigned@example.com",
+        email_verified=True,
+        role="admin",
+        password_hash=hash_password("StrongPassword123!"),
+    )
+    user.add(db_session)
+    await db_session.commit()
+
+    token = create_access_token(data={"sub": user.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    user.role = "user"
+    await user.update(db_session)
+    assert principal_cache.get(token) is None
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+    assert principal_cache.get(token)[1].role == "user"
+
+    user.is_active = False
+    await user.update(db_session)
+    with pytest.raises(AuthenticationError):
+        await client.get("/api/v1/auth/me", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_changes_keep_cached_principal(client: AsyncClient, db_session):
+    """Test that a flushed change that is rolled back does not drop the cache"""
+    user = User(
+        full_name="Rollback User",
+        email="rollback@example.com",
+        email_verified=True,
+        password_hash=hash_password("StrongPassword123!"),
+    )
+    user.add(db_session)
+    await db_session.commit()
+
+    token = create_access_token(data={"sub": user.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    user.role = "admin"
+    await db_session.flush()
+    await db_session.rollback()
+    await db_session.commit()
+    assert principal_cache.get(token) is not None
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""Test the login rate limiter"""
+
+import sys
+import pytest
+from app.core.exceptions import RateLimitExceededError
+from app.core.rate_limit import (
+    LoginRateLimiter,
+    MemoryRateLimitBackend,
+    RateLimit,
+    RedisRateLimitBackend,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_allows_up_to_limit_then_rejects():
+    clock = FakeClock(1200.0)
+    backend = MemoryRateLimitBackend(clock=clock)
+    rate = RateLimit(3, 60)
+
+    assert [await backend.hit("k", rate) for _ in range(3)] == [None, None, None]
+    retry_after = await backend.hit("k", rate)
+    assert retry_after == pytest.approx(60.0)
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_weights_previous_window():
+    """Test attempts from the last window still count while they overlap"""
+    clock = FakeClock(1200.0)
+    backend = MemoryRateLimitBackend(clock=clock)
+    rate = RateLimit(4, 60)
+    for _ in range(4):
+        assert await backend.hit("k", rate) is None
+
+    # Halfway into the next window, half of the previous 4 still count
+    clock.now = 1290.0
+    assert await backend.hit("k", rate) is None
+    assert await backend.hit("k", rate) is None
+    assert await backend.hit("k", rate) is not None
+
+    # Two windows later everything has expired
+    clock.now = 1440.0
+    assert await backend.hit("k", rate) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_is_bounded_by_eviction():
+    backend = MemoryRateLimitBackend(max_keys=100, clock=FakeClock())
+    for i in range(1000):
+        await backend.hit(f"login:ip:10.0.{i // 256}.{i % 256}", RateLimit(5, 60))
+    assert backend.stats() == {"keys": 100, "evictions": 900}
+
+
+@pytest.mark.asyncio
+async def test_limiter_keys_on_ip_and_normalized_email():
+    limiter = LoginRateLimiter(
+        backend=MemoryRateLimitBackend(clock=FakeClock()),
+        per_ip=RateLimit(100, 60),
+        per_email=RateLimit(2, 60),
+    )
+    await limiter.check("1.1.1.1", "User@Example.com")
+    await limiter.check("2.2.2.2", " user@example.com")
+    with pytest.raises(RateLimitExceededError) as exc:
+        await limiter.check("3.3.3.3", "USER@example.com")
+    assert exc.value.retry_after >= 1
+    assert limiter.stats()["rejected_email"] == 1
+
+    # Another account from the same addresses is unaffected
+    await limiter.check("3.3.3.3", "other@example.com")
+
+    # A successful login clears the account counter
+    await limiter.reset_email("user@example.com")
+    await limiter.check("3.3.3.3", "user@example.com")
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_noisy_ip_across_emails():
+    limiter = LoginRateLimiter(
+        backend=MemoryRateLimitBackend(clock=FakeClock()),
+        per_ip=RateLimit(3, 60),
+        per_email=RateLimit(100, 60),
+    )
+    for i in range(3):
+        await limiter.check("6.6.6.6", f"victim{i}@example.com")
+    with pytest.raises(RateLimitExceededError):
+        await limiter.check("6.6.6.6", "victim9@example.com")
+    assert limiter.stats()["rejected_ip"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_fails_open():
+    class BrokenBackend(MemoryRateLimitBackend):
+        async def hit(self, key, rate):
+            raise ConnectionError("backend down")
+
+    limiter = LoginRateLimiter(BrokenBackend(), RateLimit(1, 60), RateLimit(1, 60))
+    for _ in range(3):
+        await limiter.check("1.1.1.1", "a@example.com")
+    assert limiter.stats()["backend_errors"] == 3
+
+
+class FakeRedis:
+    """The slice of redis.asyncio the Redis backend uses, in memory"""
+
+    def __init__(self):
+        self.data: dict[str, int] = {}
+        self.commands: list[tuple] = []
+
+    def register_script(self, script):
+        async def run(keys, args):
+            self.data[keys[0]] = self.data.get(keys[0], 0) + 1
+            return [self.data.get(keys[1], 0), self.data[keys[0]]]
+
+        return run
+
+    async def delete(self, *names):
+        self.commands.append(("DEL", *names))
+        return sum(self.data.pop(name, None) is not None for name in names)
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_counts_windows_and_resets_with_one_delete():
+    """Test Redis keys per window and a reset that deletes just those keys"""
+    client = FakeRedis()
+    clock = FakeClock(1200.0)
+    backend = RedisRateLimitBackend(prefix="rl:", clock=clock, client=client)
+    rate = RateLimit(2, 60)
+
+    assert await backend.hit("login:email:a@example.com", rate) is None
+    clock.now = 1265.0
+    assert await backend.hit("login:email:a@example.com", rate) is None
+    assert await backend.hit("login:email:a@example.com", rate) is not None
+    assert set(client.data) == {
+        "rl:login:email:a@example.com:60:20",
+        "rl:login:email:a@example.com:60:21",
+    }
+
+    await backend.reset("login:email:a@example.com", rate)
+    assert client.commands == [
+        ("DEL", "rl:login:email:a@example.com:60:21", "rl:login:email:a@example.com:60:20")
+    ]
+    assert client.data == {}
+    assert await backend.hit("login:email:a@example.com", rate) is None
+
+
+def test_redis_backend_without_package_is_a_configuration_error(monkeypatch):
+    """Test a storage URL without the redis package fails with a clear message"""
+    monkeypatch.setitem(sys.modules, "redis", None)
+    monkeypatch.setitem(sys.modules, "redis.asyncio", None)
+    with pytest.raises(ValueError, match="redis"):
+        RedisRateLimitBackend("redis://localhost:6379/0")
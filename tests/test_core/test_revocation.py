@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Test the refresh token revocation set"""
+
+from app.core.revocation import RevocationStore
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_revoked_until_expiry():
+    clock = FakeClock()
+    store = RevocationStore(clock=clock)
+    store.revoke_token("jti-1", expires_at=1100.0)
+    store.revoke_family("fam-1", expires_at=1200.0)
+
+    assert store.is_token_revoked("jti-1")
+    assert store.is_family_revoked("fam-1")
+    assert not store.is_token_revoked("jti-2")
+
+    clock.now = 1150.0
+    assert not store.is_token_revoked("jti-1")
+    assert store.is_family_revoked("fam-1")
+    assert store.stats() == {"tokens": 0, "families": 1}
+
+
+def test_family_keeps_latest_expiry():
+    store = RevocationStore(clock=FakeClock())
+    store.revoke_family("fam", expires_at=1500.0)
+    store.revoke_family("fam", expires_at=1200.0)
+    store.clock.now = 1300.0
+    assert store.is_family_revoked("fam")
+
+
+def test_purge_is_amortized():
+    clock = FakeClock()
+    store = RevocationStore(purge_every=10, clock=clock)
+    for i in range(9):
+        store.revoke_token(f"old-{i}", expires_at=1001.0)
+    clock.now = 2000.0
+    store.revoke_token("new", expires_at=3000.0)
+    assert store.stats() == {"tokens": 1, "families": 0}
+
+
+def test_load_marks_store_warm():
+    store = RevocationStore(clock=FakeClock())
+    assert not store.loaded
+    store.load([("a", 5000.0), ("b", 5000.0)])
+    assert store.loaded
+    assert store.is_token_revoked("a") and store.is_token_revoked("b")
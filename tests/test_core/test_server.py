@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Test the production server settings"""
+
+import socket
+from app import server
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def test_worker_count_defaults_to_available_cpus(monkeypatch):
+    """Test SERVER_WORKERS=0 means one worker per usable CPU"""
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    assert server.worker_count() == server.available_cpus() >= 1
+
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+    assert server.worker_count() == 3
+
+
+def test_worker_config_uses_uvloop_and_httptools(monkeypatch):
+    """Test the uvicorn config is built from Settings"""
+    monkeypatch.setattr(settings, "SERVER_LIMIT_CONCURRENCY", 0)
+    config = server.build_config(object(), max_requests=100)
+    assert config.loop == "uvloop"
+    assert config.http == "httptools"
+    assert config.access_log is False
+    assert config.timeout_keep_alive == settings.SERVER_KEEPALIVE_SECONDS
+    assert config.limit_concurrency is None
+    assert config.limit_max_requests == 100
+
+
+def test_max_requests_jitter(monkeypatch):
+    """Test recycling is off by default and staggered when enabled"""
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 0)
+    assert server.worker_max_requests() is None
+
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 1000)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS_JITTER", 50)
+    limits = {server.worker_max_requests() for _ in range(200)}
+    assert min(limits) >= 1000 and max(limits) <= 1050
+    assert len(limits) > 1
+
+
+def test_bind_socket_listens_before_workers_start():
+    """Test the shared socket accepts connections into the backlog"""
+    sock = server.bind_socket("127.0.0.1", 0, backlog=16)
+    try:
+        client = socket.create_connection(sock.getsockname(), timeout=1)
+        client.close()
+        assert sock.get_inheritable()
+    finally:
+        sock.close()
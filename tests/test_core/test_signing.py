@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""Test JWT signing keys and the JWKS endpoint"""
+
+import pytest
+from jose import JWTError, jwk, jws, jwt
+from app.core.exceptions import AuthenticationError
+from app.services import token_service
+from app.core.signing import TokenSigner, generate_private_key_pem, load_key_dir
+
+
+@pytest.fixture
+def key_dir(tmp_path):
+    (tmp_path / "2026-01.pem").write_text(generate_private_key_pem())
+    (tmp_path / "2026-02.pem").write_text(generate_private_key_pem())
+    return tmp_path
+
+
+def _signer(key_dir, active_kid: str) -> TokenSigner:
+    private_keys, public_keys = load_key_dir(str(key_dir))
+    return TokenSigner(
+        "ES256", private_keys=private_keys, public_keys=public_keys, active_kid=active_kid
+    )
+
+
+def test_hs256_round_trip_matches_jose():
+    signer = TokenSigner("HS256", secret="testsecret")
+    token = signer.sign({"sub": "a@example.com"})
+    assert jwt.decode(token, "testsecret", algorithms=["HS256"])["sub"] == "a@example.com"
+    assert signer.verify(jwt.encode({"sub": "b"}, "testsecret", algorithm="HS256"))["sub"] == "b"
+    assert signer.jwks() == {"keys": []}
+
+
+def test_es256_tokens_carry_kid_and_verify_from_jwks(key_dir):
+    signer = _signer(key_dir, "2026-02")
+    token = signer.sign({"sub": "a@example.com"})
+    assert jws.get_unverified_header(token) == {"alg": "ES256", "typ": "JWT", "kid": "2026-02"}
+    assert signer.verify(token)["sub"] == "a@example.com"
+
+    # An edge service needs nothing but the published JWKS
+    keys = {key["kid"]: key for key in signer.jwks()["keys"]}
+    assert set(keys) == {"2026-01", "2026-02"}
+    assert "d" not in keys["2026-02"]
+    public = jwk.construct(keys["2026-02"], "ES256")
+    assert jwt.decode(token, public, algorithms=["ES256"])["sub"] == "a@example.com"
+
+
+def test_rotation_keeps_old_tokens_valid(key_dir):
+    old = _signer(key_dir, "2026-01").sign({"sub": "old"})
+
+    # Retire the old private key, keeping only its public half
+    private_pem = (key_dir / "2026-01.pem").read_text()
+    public_pem = jwk.construct(private_pem, "ES256").public_key().to_pem().decode()
+    (key_dir / "2026-01.pem").unlink()
+    (key_dir / "2026-01.pub.pem").write_text(public_pem)
+
+    signer = _signer(key_dir, "2026-02")
+    assert signer.verify(old)["sub"] == "old"
+    assert jws.get_unverified_header(signer.sign({"sub": "new"}))["kid"] == "2026-02"
+
+
+def test_unknown_kid_and_forged_tokens_rejected(key_dir, tmp_path_factory):
+    signer = _signer(key_dir, "2026-02")
+    other_dir = tmp_path_factory.mktemp("other")
+    (other_dir / "2026-02.pem").write_text(generate_private_key_pem())
+    (other_dir / "rogue.pem").write_text(generate_private_key_pem())
+
+    with pytest.raises(JWTError):
+        signer.verify(_signer(other_dir, "rogue").sign({"sub": "x"}))
+    with pytest.raises(JWTError):
+        signer.verify(_signer(other_dir, "2026-02").sign({"sub": "x"}))
+    with pytest.raises(JWTError):
+        signer.verify(jwt.encode({"sub": "x"}, "testsecret", algorithm="HS256"))
+
+
+@pytest.mark.parametrize("token", ["garbage", "a.b.c", ""])
+def test_es256_malformed_token_raises_jwt_error(key_dir, token):
+    with pytest.raises(JWTError):
+        _signer(key_dir, "2026-02").verify(token)
+
+
+@pytest.mark.asyncio
+async def test_es256_malformed_token_rejected_by_me_and_refresh(client, key_dir, monkeypatch):
+    monkeypatch.setattr(token_service, "token_signer", _signer(key_dir, "2026-02"))
+
+    # Same rejection as an HS256 token that does not verify
+    with pytest.raises(AuthenticationError):
+        await client.get("/api/v1/auth/me", headers={"Authorization": "Bearer garbage"})
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": "garbage"})
+    assert response.status_code == 401
+
+
+def test_missing_active_key_fails_fast(key_dir):
+    with pytest.raises(ValueError):
+        _signer(key_dir, "nope")
+
+
+@pytest.mark.asyncio
+async def test_jwks_endpoint(client):
+    response = await client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""Test BaseModel bulk insert, update and upsert helpers"""
+
+import pytest
+from sqlalchemy import func, select
+from app.models.user import User
+
+
+def _rows(prefix: str, count: int) -> list[dict]:
+    return [
+        {
+            "email": f"{prefix}{i}@example.com",
+            "full_name": f"Bulk User {i}",
+            "password_hash": "x",
+        }
+        for i in range(count)
+    ]
+
+
+async def _count(db, prefix: str) -> int:
+    query = select(func.count()).select_from(User).where(User.email.like(f"{prefix}%"))
+    return (await db.execute(query)).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_in_chunks_returns_keys(db_session):
+    """Test chunked insert with returned primary keys and server defaults"""
+    ids = await User.bulk_insert(
+        db_session, _rows("bulk-insert-", 25), chunk_size=10, returning=True
+    )
+
+    assert len(ids) == 25
+    assert len(set(ids)) == 25
+    assert await _count(db_session, "bulk-insert-") == 25
+
+    user = await User.fetch_unique(db_session, id=ids[0])
+    assert user.email == "bulk-insert-0@example.com"
+    assert user.created_at is not None
+    assert user.role == "user"
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_ignore_conflicts(db_session):
+    """Test that duplicates are skipped instead of failing the batch"""
+    await User.bulk_insert(db_session, _rows("bulk-dup-", 3))
+    await User.bulk_insert(db_session, _rows("bulk-dup-", 5), ignore_conflicts=True)
+
+    assert await _count(db_session, "bulk-dup-") == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_rolls_back_whole_batch(db_session):
+    """Test that a failing chunk leaves no partial import behind"""
+    await User.bulk_insert(db_session, _rows("bulk-atomic-", 1))
+
+    with pytest.raises(Exception):
+        await User.bulk_insert(db_session, _rows("bulk-atomic-", 6), chunk_size=2)
+
+    assert await _count(db_session, "bulk-atomic-") == 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_updates_existing_rows(db_session):
+    """Test ON CONFLICT DO UPDATE on the live lower(email) index"""
+    await User.bulk_insert(db_session, _rows("bulk-upsert-", 2))
+
+    rows = _rows("bulk-upsert-", 4)
+    for row in rows:
+        row["full_name"] = "Renamed"
+    await User.upsert_many(
+        db_session,
+        rows,
+        conflict_columns=[func.lower(User.email)],
+        update_columns=["full_name"],
+        conflict_where=User.not_deleted(),
+    )
+
+    assert await _count(db_session, "bulk-upsert-") == 4
+    result = await db_session.execute(
+        select(User.full_name).where(User.email.like("bulk-upsert-%"))
+    )
+    assert set(result.scalars().all()) == {"Renamed"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_primary_key(db_session):
+    """Test updating many rows keyed by id"""
+    ids = await User.bulk_insert(db_session, _rows("bulk-update-", 3), returning=True)
+
+    await User.bulk_update(db_session, [{"id": pk, "role": "admin"} for pk in ids])
+
+    result = await db_session.execute(
+        select(User.role).where(User.id.in_(ids)).execution_options(populate_existing=True)
+    )
+    assert set(result.scalars().all()) == {"admin"}
+
+
+@pytest.mark.asyncio
+async def test_insert_unless_exists_returns_row_or_none(db_session):
+    """Test a single-statement insert fills defaults and skips duplicates"""
+    row = _rows("insert-unless-", 1)[0]
+    conflict = {"conflict_columns": [func.lower(User.email)], "conflict_where": User.not_deleted()}
+    user = await User.insert_unless_exists(db_session, **conflict, **row)
+
+    assert user is not None
+    assert user.id is not None
+    assert user.created_at is not None
+    assert user.role == "user"
+    assert user in db_session
+
+    duplicate = await User.insert_unless_exists(
+        db_session, **conflict, **{**row, "full_name": "Someone Else"}
+    )
+    assert duplicate is None
+    assert await _count(db_session, "insert-unless-") == 1
+
+
+@pytest.mark.asyncio
+async def test_update_where_applies_returned_values(db_session):
+    """Test a conditional UPDATE ... RETURNING updates the object without a refresh"""
+    await User.bulk_insert(db_session, _rows("update-where-", 1))
+    user = await User.fetch_unique(db_session, email="update-where-0@example.com")
+    before = user.updated_at
+
+    assert await user.update_where(db_session, {"email_verified": False}, email_verified=True)
+    assert user.email_verified is True
+    assert user.updated_at >= before
+    assert not db_session.is_modified(user)
+
+    # Already verified: the condition no longer matches
+    assert not await user.update_where(
+        db_session, {"email_verified": False}, full_name="Changed"
+    )
+    assert user.full_name == "Bulk User 0"
+
+    rows = await User.update_returning(
+        db_session, {"email": "update-where-0@example.com"}, {"role": "admin"}
+    )
+    assert [(row.id, row.role) for row in rows] == [(user.id, "admin")]
+    assert user.role == "admin"
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""Test that email lookups ignore case and are served by the lower(email) index"""
+
+import pytest
+from sqlalchemy import event
+from app.models.user import User
+
+
+async def _plan_of_lookup(db, email: str) -> str:
+    """The query plan of the statement fetch_by_email() sends"""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, *args):
+        sent.append((statement, parameters))
+
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await User.fetch_by_email(db, email)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    statement, parameters = sent[-1]
+
+    conn = await db.connection()
+    if db.bind.dialect.name == "postgresql":
+        # Tiny test tables are cheaper to scan; ask whether the index can be used
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        return "\n".join(row[0] for row in rows.all())
+    rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in rows.all())
+
+
+@pytest.mark.asyncio
+async def test_fetch_by_email_ignores_case(db_session):
+    """Test the accessor normalizes the email it is given"""
+    user = User(full_name="Mixed Case", email="mixed.case@example.com", password_hash="x")
+    user.add(db_session)
+    await db_session.commit()
+
+    found = await User.fetch_by_email(db_session, "  Mixed.Case@Example.COM ")
+    assert found is not None and found.id == user.id
+    assert await User.fetch_by_email(db_session, "other@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_email_lookup_uses_lower_email_index(db_session):
+    """Test the normalized lookup is an index search, not a table scan"""
+    plan = await _plan_of_lookup(db_session, "Indexed@Example.com")
+
+    if db_session.bind.dialect.name == "postgresql":
+        assert "Index Scan using ux_users_email_lower" in plan
+    else:
+        assert "USING INDEX ux_users_email_lower" in plan
+        assert "SCAN users" not in plan
+
+
+@pytest.mark.asyncio
+async def test_registration_rejects_email_differing_only_in_case(client, db_session):
+    """Test the conflict target is the lower(email) index"""
+    payload = {
+        "email": "Case.Twin@example.com",
+        "full_name": "Case Twin",
+        "password": "StrongPassword123!",
+        "confirm_password": "StrongPassword123!",
+    }
+    assert (await client.post("/api/v1/auth/register", json=payload)).status_code == 201
+
+    payload["email"] = "case.twin@EXAMPLE.com"
+    assert (await client.post("/api/v1/auth/register", json=payload)).status_code == 409
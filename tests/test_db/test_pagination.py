@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""Test keyset pagination and streaming on BaseModel"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.core.exceptions import InvalidCursorError
+from app.models.user import User
+
+ROLE = "pagination-test"
+
+
+@pytest.fixture
+async def users(db_session):
+    """Twelve users with distinct, increasing created_at values"""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "email": f"page{i:02d}@example.com",
+            "full_name": f"Page User {i}",
+            "password_hash": "x",
+            "role": ROLE,
+            "created_at": start + timedelta(minutes=i // 2),
+        }
+        for i in range(12)
+    ]
+    await User.bulk_insert(db_session, rows, ignore_conflicts=True)
+
+    # Pairs share a created_at, so the id breaks ties
+    result = await db_session.execute(
+        select(User.email, User.created_at, User.id).where(User.role == ROLE)
+    )
+    return [row.email for row in sorted(result.all(), key=lambda r: (r.created_at, r.id))]
+
+
+@pytest.mark.asyncio
+async def test_paginate_walks_all_rows_once(db_session, users):
+    """Test that following cursors visits every row exactly once in order"""
+    seen, cursor = [], None
+    while True:
+        page = await User.paginate(db_session, cursor=cursor, limit=5, role=ROLE)
+        seen.extend(user.email for user in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == users
+
+
+@pytest.mark.asyncio
+async def test_paginate_with_column_projection(db_session, users):
+    """Test that projections return lightweight rows, not ORM objects"""
+    page = await User.paginate(db_session, limit=3, columns=["email"], role=ROLE)
+
+    assert len(page.items) == 3
+    assert not isinstance(page.items[0], User)
+    assert page.items[0].email == users[0]
+    assert page.next_cursor is not None
+
+
+@pytest.mark.asyncio
+async def test_paginate_caps_page_size(db_session, users, monkeypatch):
+    """Test that requested page sizes are capped"""
+    monkeypatch.setattr("app.db.base_model.settings.MAX_PAGE_SIZE", 4)
+    page = await User.paginate(db_session, limit=1000, role=ROLE)
+    assert len(page.items) == 4
+
+
+@pytest.mark.asyncio
+async def test_paginate_rejects_garbage_cursor(db_session):
+    """Test that tampered cursors raise InvalidCursorError"""
+    with pytest.raises(InvalidCursorError):
+        await User.paginate(db_session, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_stream_all_yields_every_row(db_session, users):
+    """Test the streaming iterator over a server-side cursor"""
+    emails = [
+        row.email
+        async for row in User.stream_all(
+            db_session, columns=["email"], batch_size=5, role=ROLE
+        )
+    ]
+    assert emails == users
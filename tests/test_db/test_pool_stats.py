@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""Test connection pool configuration and stats"""
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.config import get_settings
+from app.db.pool import InstrumentedAsyncQueuePool, get_pool_stats
+from app.db.session import engine
+
+settings = get_settings()
+
+
+def test_primary_engine_uses_settings():
+    """Test that the primary engine is sized from Settings"""
+    assert engine.echo == settings.SQL_ECHO
+    assert isinstance(engine.pool, InstrumentedAsyncQueuePool)
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.url.host == settings.POSTGRES_SERVER
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts_and_timeouts(tmp_path):
+    """Test checked-out, wait and timeout counters"""
+    test_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        async with test_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            stats = get_pool_stats(test_engine)
+            assert stats["checked_out"] == 1
+            assert stats["overflow"] == 0
+
+            with pytest.raises(exc.TimeoutError):
+                async with test_engine.connect():
+                    pass
+
+        stats = get_pool_stats(test_engine)
+        assert stats["checked_out"] == 0
+        assert stats["acquisitions"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["max_wait_seconds"] >= 0.05
+    finally:
+        await test_engine.dispose()
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""Test read-replica routing with two SQLite files"""
+
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.db.base_model import Base
+from app.db.session import build_sessionmaker
+from app.models.user import User
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    """Primary and replica databases that never replicate to each other"""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for target in (primary, replica):
+        async with target.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+def _user(email: str, full_name: str) -> User:
+    return User(email=email, full_name=full_name, password_hash="x")
+
+
+async def _in_new_request(coro):
+    """Run in a fresh task so pins from one scenario do not leak"""
+    return await asyncio.create_task(coro)
+
+
+@pytest.mark.asyncio
+async def test_fetch_helpers_read_from_replica(engines):
+    """Test that read sessions route fetch_* helpers to the replica"""
+    primary, replica = engines
+    async def seed_replica():
+        async with build_sessionmaker(replica)() as db:
+            await _user("reader@example.com", "Replica Copy").insert(db)
+
+    await _in_new_request(seed_replica())
+
+    async def scenario():
+        async with build_sessionmaker(primary, [replica], read_only=True)() as db:
+            user = await User.fetch_unique(db, email="reader@example.com")
+            assert user is not None
+            assert user.full_name == "Replica Copy"
+
+        async with build_sessionmaker(primary, [replica])() as db:
+            assert await User.fetch_unique(db, email="reader@example.com") is None
+
+    await _in_new_request(scenario())
+
+
+@pytest.mark.asyncio
+async def test_writes_go_to_primary_and_pin_later_reads(engines):
+    """Test read-your-writes after a commit in the same request"""
+    primary, replica = engines
+    read_session = build_sessionmaker(primary, [replica], read_only=True)
+
+    async def scenario():
+        async with read_session() as db:
+            await _user("writer@example.com", "Writer").insert(db)
+
+        # A separate read session in the same request must see the write
+        async with read_session() as db:
+            user = await User.fetch_unique(db, email="writer@example.com")
+            assert user is not None
+
+    await _in_new_request(scenario())
+
+    async with build_sessionmaker(replica)() as db:
+        assert await User.fetch_unique(db, email="writer@example.com") is None
+
+    async def next_request():
+        async with read_session() as db:
+            assert await User.fetch_unique(db, email="writer@example.com") is None
+
+    await _in_new_request(next_request())
+
+
+@pytest.mark.asyncio
+async def test_reads_after_uncommitted_write_stay_on_primary(engines):
+    """Test that a session that has flushed keeps reading from the primary"""
+    primary, replica = engines
+
+    async def scenario():
+        async with build_sessionmaker(primary, [replica], read_only=True)() as db:
+            _user("pending@example.com", "Pending").add(db)
+            await db.flush()
+            assert await User.fetch_unique(db, email="pending@example.com") is not None
+            await db.rollback()
+
+    await _in_new_request(scenario())
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""Test soft-delete scoping and the purge job"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select
+from app.db.session import build_sessionmaker
+from app.models.user import User
+from app.workers.purge_deleted import purge
+
+
+async def _user(db, email: str) -> User:
+    user = User(full_name="Soft Delete", email=email, password_hash="x")
+    user.add(db)
+    await db.commit()
+    return user
+
+
+async def _total(db, prefix: str) -> int:
+    query = (
+        select(func.count())
+        .select_from(User)
+        .where(User.email.like(f"{prefix}%"))
+        .execution_options(include_deleted=True)
+    )
+    return (await db.execute(query)).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_deleted_rows_are_hidden_unless_asked_for(db_session):
+    """Test query helpers skip deleted rows and include_deleted opts out"""
+    user = await _user(db_session, "hidden@example.com")
+    assert await user.soft_delete(db_session)
+    assert user.is_deleted is True and user.deleted_at is not None
+    assert not await user.soft_delete(db_session)
+
+    assert await User.fetch_by_email(db_session, "hidden@example.com") is None
+    assert await User.fetch_unique(db_session, email="hidden@example.com") is None
+    page = await User.paginate(db_session, limit=500)
+    assert user.id not in {item.id for item in page.items}
+
+    found = await User.fetch_by_email(db_session, "hidden@example.com", include_deleted=True)
+    assert found.id == user.id
+    assert await User.fetch_unique(db_session, email="hidden@example.com", include_deleted=True)
+
+    # Objects already in the session can still be refreshed
+    await db_session.refresh(user)
+    assert user.is_deleted is True
+
+
+@pytest.mark.asyncio
+async def test_deleted_email_can_register_again(client, db_session):
+    """Test the partial unique index ignores deleted users"""
+    old = await _user(db_session, "returning@example.com")
+    await old.soft_delete(db_session)
+
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "Returning@example.com",
+            "full_name": "Returning User",
+            "password": "StrongPassword123!",
+            "confirm_password": "StrongPassword123!",
+        },
+    )
+    assert response.status_code == 201
+    assert response.json()["data"]["id"] != str(old.id)
+    assert await _total(db_session, "returning@") == 2
+
+
+@pytest.mark.asyncio
+async def test_purge_removes_only_expired_rows_in_batches(db_session):
+    """Test the purge job hard-deletes rows past retention, a batch at a time"""
+    expired = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=40)
+    users = [await _user(db_session, f"purge-{i}@example.com") for i in range(5)]
+    for user in users[:3]:
+        await user.update_where(db_session, is_deleted=True, deleted_at=expired)
+    await users[3].soft_delete(db_session)
+
+    purged = await purge(build_sessionmaker(db_session.bind), retention_days=30, batch_size=2, pause=0)
+    assert purged == {"users": 3}
+
+    assert await _total(db_session, "purge-") == 2
+    assert await User.fetch_unique(db_session, email="purge-4@example.com") is not None
+    assert await User.fetch_unique(db_session, email="purge-3@example.com", include_deleted=True)
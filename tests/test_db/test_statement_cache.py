@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""Test the cached statements behind the BaseModel fetch helpers"""
+
+import pytest
+from app.models.user import User
+
+
+@pytest.mark.asyncio
+async def test_fetch_helpers_reuse_one_statement_per_column_set(db_session):
+    """Test lookups on the same columns share a statement and still filter"""
+    await User.bulk_insert(
+        db_session,
+        [
+            {"email": f"cached-{i}@example.com", "full_name": "Statement Cache User", "password_hash": "x"}
+            for i in range(3)
+        ],
+    )
+
+    first, params = User._select_by(email="cached-0@example.com")
+    second, _ = User._select_by(email="cached-1@example.com")
+    assert first is second
+    assert params == {"email": "cached-0@example.com"}
+    assert User._select_by(email="a", role="user")[0] is User._select_by(role="user", email="b")[0]
+
+    user = await User.fetch_unique(db_session, email="cached-1@example.com")
+    assert user.email == "cached-1@example.com"
+    assert await User.fetch_one(db_session, email="missing@example.com") is None
+    matches = await User.fetch_all(db_session, full_name="Statement Cache User", role="user")
+    assert len(matches) == 3
+
+
+@pytest.mark.asyncio
+async def test_none_filters_still_match_null(db_session):
+    """Test a None value compares with IS NULL rather than a bound parameter"""
+    await User.bulk_insert(
+        db_session,
+        [{"email": "no-phone@example.com", "full_name": "No Phone", "password_hash": "x"}],
+    )
+    user = await User.fetch_unique(db_session, email="no-phone@example.com", phone=None)
+    assert user is not None
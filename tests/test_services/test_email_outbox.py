@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+"""Test the email outbox and its worker"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.models.email_outbox import EmailOutbox
+from app.models.user import User
+from app.services.outbox_service import EmailOutboxService, settings
+from app.workers.email_worker import EmailOutboxWorker
+
+
+class FakeTransport:
+    """Stands in for the SMTP pool; fails the recipients it is told to"""
+
+    def __init__(self, failing: set[str] = frozenset()):
+        self.failing = failing
+        self.delivered = []
+        self.closed = False
+
+    async def send_many(self, messages):
+        errors = []
+        for message in messages:
+            if message["To"] in self.failing:
+                errors.append(ConnectionError("server unavailable"))
+            else:
+                self.delivered.append(message)
+                errors.append(None)
+        return errors
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+async def sessions(db_session):
+    await db_session.execute(delete(EmailOutbox))
+    await db_session.commit()
+    return async_sessionmaker(bind=db_session.bind, expire_on_commit=False)
+
+
+async def _enqueue(sessions, *emails: str) -> None:
+    async with sessions() as db:
+        for email in emails:
+            user = User(full_name="Outbox User", email=email, password_hash="x")
+            EmailOutboxService.enqueue_verification(db, user)
+        await db.commit()
+
+
+async def _jobs(sessions) -> dict[str, EmailOutbox]:
+    async with sessions() as db:
+        rows = (await db.execute(select(EmailOutbox))).scalars().all()
+        return {job.recipient: job for job in rows}
+
+
+@pytest.mark.asyncio
+async def test_registration_enqueues_outbox_job(client, db_session, monkeypatch):
+    """Test that registering in outbox mode writes a pending job"""
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "outbox")
+    payload = {
+        "full_name": "Outbox Register",
+        "email": "outbox_register@example.com",
+        "password": "Password123!",
+        "confirm_password": "Password123!",
+    }
+    response = await client.post("/api/v1/auth/register", json=payload)
+    assert response.status_code == 201
+
+    job = await EmailOutbox.fetch_unique(db_session, recipient="outbox_register@example.com")
+    assert job is not None
+    assert job.status == EmailOutbox.PENDING
+    assert job.payload == {
+        "full_name": "Outbox Register",
+        "request_id": response.headers["X-Request-ID"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_worker_sends_due_jobs(sessions):
+    """Test that a batch is claimed, sent and marked sent"""
+    await _enqueue(sessions, "a@example.com", "b@example.com")
+    transport = FakeTransport()
+    worker = EmailOutboxWorker(session_factory=sessions, transport=transport, batch_size=10)
+
+    assert await worker.run_once() == 2
+    assert sorted(m["To"] for m in transport.delivered) == ["a@example.com", "b@example.com"]
+    html = transport.delivered[0].get_payload()[-1].get_payload(decode=True).decode()
+    assert "verify-email?token=" in html
+
+    jobs = await _jobs(sessions)
+    assert {job.status for job in jobs.values()} == {EmailOutbox.SENT}
+    assert all(job.attempts == 1 and job.sent_at is not None for job in jobs.values())
+    assert worker.stats()["sent"] == 2
+
+    # Nothing left to do
+    assert await worker.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_respects_batch_size(sessions):
+    """Test that one poll claims at most batch_size jobs"""
+    await _enqueue(sessions, *(f"user{i}@example.com" for i in range(5)))
+    worker = EmailOutboxWorker(session_factory=sessions, transport=FakeTransport(), batch_size=2)
+
+    assert await worker.run_once() == 2
+    assert await worker.run_once() == 2
+    assert await worker.run_once() == 1
+    assert worker.stats()["batches"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_send_is_retried_with_backoff(sessions):
+    """Test that a failure reschedules the job instead of losing it"""
+    await _enqueue(sessions, "ok@example.com", "down@example.com")
+    worker = EmailOutboxWorker(
+        session_factory=sessions, transport=FakeTransport(failing={"down@example.com"})
+    )
+
+    before = datetime.now(timezone.utc)
+    await worker.run_once()
+
+    jobs = await _jobs(sessions)
+    failed = jobs["down@example.com"]
+    assert jobs["ok@example.com"].status == EmailOutbox.SENT
+    assert failed.status == EmailOutbox.PENDING
+    assert failed.attempts == 1
+    assert "server unavailable" in failed.last_error
+    next_attempt = failed.next_attempt_at.replace(tzinfo=timezone.utc)
+    assert next_attempt >= before + timedelta(seconds=settings.EMAIL_OUTBOX_BACKOFF_SECONDS)
+    assert worker.stats()["retried"] == 1
+
+    # Not due yet, so the next poll leaves it alone
+    assert await worker.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_job_is_dead_lettered_after_max_attempts(sessions, monkeypatch):
+    """Test that a job stops retrying once attempts are exhausted"""
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 0)
+    await _enqueue(sessions, "dead@example.com")
+    worker = EmailOutboxWorker(
+        session_factory=sessions, transport=FakeTransport(failing={"dead@example.com"})
+    )
+
+    await worker.run_once()
+    assert (await _jobs(sessions))["dead@example.com"].status == EmailOutbox.PENDING
+
+    await worker.run_once()
+    job = (await _jobs(sessions))["dead@example.com"]
+    assert job.status == EmailOutbox.DEAD
+    assert job.attempts == 2
+    assert worker.stats()["dead"] == 1
+
+    assert await worker.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_lag_is_measured_from_when_the_job_became_due(sessions):
+    """Test that a retried job's backoff does not count as queue lag"""
+    await _enqueue(sessions, "retried@example.com")
+    now = datetime.now(timezone.utc)
+    async with sessions() as db:
+        job = (await db.execute(select(EmailOutbox))).scalars().one()
+        job.created_at = now - timedelta(hours=1)
+        job.next_attempt_at = now - timedelta(seconds=5)
+        await db.commit()
+
+    worker = EmailOutboxWorker(session_factory=sessions, transport=FakeTransport())
+    assert await worker.run_once() == 1
+    assert 5 <= worker.stats()["lag_seconds"] < 60
+
+
+def test_backoff_is_exponential_and_capped(monkeypatch):
+    """Test the retry delay doubles per attempt up to the cap"""
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 10)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", 60)
+    delays = [EmailOutboxService.backoff(n).total_seconds() for n in range(1, 6)]
+    assert delays == [10, 20, 40, 60, 60]
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""Test the compiled email template registry"""
+
+import os
+import pytest
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from app.core.mail_config import mail_conf
+from app.services.email_service import EmailService
+from app.services.email_templates import SUBJECTS, EmailTemplateRegistry, settings
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    (tmp_path / "welcome.html").write_text("<p>Hi {{ name }}</p><a href=\"{{ url }}\">go</a>")
+    (tmp_path / "welcome.txt").write_text("Hi {{ name }}\n{{ url }}\n")
+    (tmp_path / "digest.html").write_text(
+        "{% for item in items %}<li>{{ item }}</li>{% endfor %}"
+    )
+    return tmp_path
+
+
+def _jinja(folder) -> Environment:
+    return Environment(loader=FileSystemLoader(folder), autoescape=select_autoescape(["html"]))
+
+
+@pytest.mark.parametrize("name", ["Lex", "<b>Tom & \"Jerry\"</b>", None, 42])
+def test_prepared_render_matches_jinja(template_dir, name):
+    """Test that the substitution fast path renders exactly like Jinja"""
+    registry = EmailTemplateRegistry(template_dir, {"welcome": "Hello {{ name }}"})
+    rendered = registry.render("welcome", name=name, url="https://x.test/?a=1&b=2")
+
+    env = _jinja(template_dir)
+    context = {"name": name, "url": "https://x.test/?a=1&b=2"}
+    assert rendered.html == env.get_template("welcome.html").render(context)
+    assert rendered.text == env.get_template("welcome.txt").render(context)
+    assert rendered.subject == f"Hello {name}"
+
+
+def test_missing_variable_renders_empty(template_dir):
+    registry = EmailTemplateRegistry(template_dir, {})
+    assert registry.render("welcome", url="u").html == "<p>Hi </p><a href=\"u\">go</a>"
+
+
+def test_templates_with_logic_fall_back_to_jinja(template_dir):
+    registry = EmailTemplateRegistry(template_dir, {})
+    rendered = registry.render("digest", items=["a", "<b>"])
+    assert rendered.html == "<li>a</li><li>&lt;b&gt;</li>"
+    assert rendered.text is None
+
+
+def test_templates_compile_once(template_dir):
+    """Test that repeated renders reuse the compiled templates"""
+    registry = EmailTemplateRegistry(template_dir, {})
+    registry.load()
+    compiled = registry.compilations
+    for _ in range(100):
+        registry.render("welcome", name="n", url="u")
+    assert registry.compilations == compiled == 3
+
+
+def test_auto_reload_picks_up_edits(template_dir):
+    """Test that DEBUG mode recompiles a template after it changes on disk"""
+    registry = EmailTemplateRegistry(template_dir, {}, auto_reload=True)
+    assert registry.render("welcome", name="n", url="u").html.startswith("<p>Hi n")
+
+    path = template_dir / "welcome.html"
+    path.write_text("<p>Hello {{ name }}</p>")
+    mtime = os.stat(path).st_mtime + 5
+    os.utime(path, (mtime, mtime))
+    assert registry.render("welcome", name="n").html == "<p>Hello n</p>"
+
+
+def test_subject_must_be_plain_substitution(template_dir):
+    with pytest.raises(ValueError):
+        EmailTemplateRegistry(template_dir, {"welcome": "{% if x %}Hi{% endif %}"})
+
+
+def test_verification_message_parts():
+    """Test the verification email carries the link in both parts"""
+    message = EmailService.build_verification_message("a@example.com", "A", "tok")
+    assert message["Subject"] == SUBJECTS["verification"]
+    assert message["To"] == "a@example.com"
+    assert message.get_content_type() == "multipart/alternative"
+
+    text_part, html_part = message.get_payload()
+    assert text_part.get_content_type() == "text/plain"
+    assert html_part.get_content_type() == "text/html"
+    text = text_part.get_payload(decode=True).decode()
+    html = html_part.get_payload(decode=True).decode()
+
+    url = f"{settings.BASE_URI}/api/v1/auth/verify-email?token=tok"
+    assert url in text
+    assert html == _jinja(mail_conf.TEMPLATE_FOLDER).get_template("verification.html").render(
+        url=url, name="A"
+    )
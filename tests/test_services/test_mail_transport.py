@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""Test the pooled SMTP transport against a local aiosmtpd server"""
+
+import socket
+from email.message import EmailMessage
+import pytest
+from aiosmtpd.controller import Controller
+from app.services.mail_transport import SMTPConnectionPool
+
+
+class RecordingHandler:
+    """aiosmtpd handler that keeps every delivered envelope"""
+
+    def __init__(self):
+        self.envelopes = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        self.sessions.add(id(session))
+        return "250 Message accepted for delivery"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = "Hello"
+    message["From"] = "noreply@example.com"
+    message["To"] = recipient
+    message.set_content("<p>Hi</p>", subtype="html")
+    return message
+
+
+def _pool(controller, **kwargs) -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        hostname=controller.hostname, port=controller.port, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_sequential_sends_reuse_one_connection(smtp_server):
+    """Test that the connection stays open between messages"""
+    controller, handler = smtp_server
+    pool = _pool(controller, size=2)
+    try:
+        for i in range(5):
+            await pool.send(_message(f"user{i}@example.com"))
+    finally:
+        await pool.close()
+
+    assert len(handler.envelopes) == 5
+    assert len(handler.sessions) == 1
+    assert pool.stats()["sent"] == 5
+
+
+@pytest.mark.asyncio
+async def test_send_many_is_capped_by_pool_size(smtp_server):
+    """Test that a batch is spread over at most `size` connections"""
+    controller, handler = smtp_server
+    pool = _pool(controller, size=3)
+    try:
+        errors = await pool.send_many(
+            [_message(f"batch{i}@example.com") for i in range(20)]
+        )
+    finally:
+        await pool.close()
+
+    assert errors == [None] * 20
+    assert len(handler.envelopes) == 20
+    assert len(handler.sessions) <= 3
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_server_drops_connection(smtp_server):
+    """Test that a dead pooled connection is replaced transparently"""
+    controller, handler = smtp_server
+    pool = _pool(controller, size=1)
+    try:
+        await pool.send(_message("first@example.com"))
+        # Simulate the server timing the idle connection out
+        pool._idle._queue[0].client.close()
+        await pool.send(_message("second@example.com"))
+    finally:
+        await pool.close()
+
+    assert [e.rcpt_tos for e in handler.envelopes] == [
+        ["first@example.com"],
+        ["second@example.com"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_suppressed_pool_never_connects():
+    """Test SUPPRESS_SEND behaviour"""
+    pool = SMTPConnectionPool(hostname="127.0.0.1", port=1, suppress_send=True)
+    await pool.send(_message("nobody@example.com"))
+    assert pool.stats()["open_connections"] == 0
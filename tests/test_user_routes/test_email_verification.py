@@ -3,13 +3,16 @@
 
 import pytest
 from unittest.mock import AsyncMock, patch
+from sqlalchemy import event
 from app.models.user import User
 from app.services.token_service import create_verification_token
 from app.core.security import hash_password
+from app.core.config import get_settings
 
 @pytest.mark.asyncio
-async def test_registration_sends_email(client, db_session):
+async def test_registration_sends_email(client, db_session, monkeypatch):
     """Test that registration triggers an email send"""
+    monkeypatch.setattr(get_settings(), "EMAIL_DELIVERY_MODE", "background")
     with patch("app.services.auth_service.EmailService.send_verification_email", new_callable=AsyncMock) as mock_send:
         payload = {
             "full_name": "Test Email User",
@@ -74,3 +77,38 @@ async def test_verify_email_already_verified(client, db_session):
     
     response = await client.get(f"/api/v1/auth/verify-email?token={token}")
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_verify_email_is_one_conditional_update(client, db_session):
+    """Test verification reads nothing before writing"""
+    user = User(
+        full_name="Single Update",
+        email="single-update@example.com",
+        email_verified=False,
+        password_hash="x",
+    )
+    user.add(db_session)
+    await db_session.commit()
+    token = create_verification_token(user.email)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(f"/api/v1/auth/verify-email?token={token}")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    user_statements = [s for s in statements if "users" in s]
+    assert len(user_statements) == 1
+    assert user_statements[0].startswith("UPDATE users")
+    assert "RETURNING" in user_statements[0]
+
+    await db_session.refresh(user)
+    assert user.email_verified is True
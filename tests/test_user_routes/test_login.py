@@ -1,10 +1,14 @@
 #!/usr/bin/python3
 """Test Login Endpoint"""
 
+import asyncio
 import pytest
 from httpx import AsyncClient
 from app.models.user import User
-from app.core.security import hash_password
+from app.core.security import build_pwd_context, hash_password, password_needs_rehash
+from app.core.exceptions import AuthenticationError
+from app.core.rate_limit import RateLimit, login_limiter
+from app.services.auth_service import AuthService, rehash_tasks
 
 @pytest.mark.asyncio
 async def test_login_success(client: AsyncClient, db_session):
@@ -81,3 +85,59 @@ async def test_swagger_login(client: AsyncClient, db_session):
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+
+@pytest.mark.asyncio
+async def test_login_rate_limited_per_email(client: AsyncClient, monkeypatch):
+    """Test repeated attempts on one account get 429 before any auth work"""
+    monkeypatch.setattr(login_limiter, "per_email", RateLimit(3, 60))
+    calls = []
+
+    async def fake_authenticate(db, email, password):
+        calls.append(email)
+        raise AuthenticationError()
+
+    monkeypatch.setattr(AuthService, "authenticate_user", fake_authenticate)
+
+    login_data = {"email": "Target@Example.com ", "password": "Guess123!"}
+    for _ in range(3):
+        response = await client.post("/api/v1/auth/login", json=login_data)
+        assert response.status_code == 401
+
+    login_data["email"] = "target@example.com"
+    response = await client.post("/api/v1/auth/login", json=login_data)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["error"]["retry_after"] == int(response.headers["Retry-After"])
+
+    form_data = {"username": "TARGET@example.com", "password": "Guess123!"}
+    response = await client.post("/api/v1/auth/token", data=form_data)
+    assert response.status_code == 429
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password(client: AsyncClient, db_session):
+    """Test a hash made with old Argon2 parameters is upgraded after login"""
+    password = "StrongPassword123!"
+    old_hash = build_pwd_context(time_cost=1, memory_cost=1024, parallelism=1).hash(password)
+    user = User(
+        full_name="Rehash User",
+        email="rehash@example.com",
+        email_verified=True,
+        password_hash=old_hash
+    )
+    user.add(db_session)
+    await db_session.commit()
+
+    response = await client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": password})
+    assert response.status_code == 200
+    assert rehash_tasks
+    await asyncio.gather(*rehash_tasks)
+
+    await db_session.refresh(user)
+    assert user.password_hash != old_hash
+    assert not password_needs_rehash(user.password_hash)
+
+    response = await client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": password})
+    assert response.status_code == 200
+    assert not rehash_tasks
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""Test Refresh Token Rotation"""
+
+import pytest
+from httpx import AsyncClient
+from app.models.user import User
+from app.core.exceptions import AuthenticationError
+from app.core.revocation import revocations
+from app.core.security import hash_password
+
+
+async def _login(client: AsyncClient, db_session, email: str) -> dict:
+    password = "StrongPassword123!"
+    user = User(
+        full_name="Refresh User",
+        email=email,
+        email_verified=True,
+        password_hash=hash_password(password)
+    )
+    user.add(db_session)
+    await db_session.commit()
+
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+@pytest.mark.asyncio
+async def test_login_returns_refresh_token(client: AsyncClient, db_session):
+    data = await _login(client, db_session, "refresh_login@example.com")
+    assert data["access_token"]
+    assert data["refresh_token"]
+    assert data["token_type"] == "bearer"
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_tokens(client: AsyncClient, db_session):
+    """Test a refresh token buys a new pair that works for /me"""
+    data = await _login(client, db_session, "refresh_rotate@example.com")
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 200
+    rotated = response.json()["data"]
+    assert rotated["refresh_token"] != data["refresh_token"]
+
+    response = await client.get(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {rotated['access_token']}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["email"] == "refresh_rotate@example.com"
+
+    # The new refresh token rotates again
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_reused_refresh_token_revokes_family(client: AsyncClient, db_session):
+    """Test replaying a rotated token kills every token in its family"""
+    data = await _login(client, db_session, "refresh_reuse@example.com")
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    rotated = response.json()["data"]
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 401
+
+    # The legitimately rotated token is revoked too
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_reuse_detected_after_cold_start(client: AsyncClient, db_session):
+    """Test reuse is still caught when this process never saw the rotation"""
+    data = await _login(client, db_session, "refresh_cold@example.com")
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    rotated = response.json()["data"]
+
+    revocations.clear()
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 401
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_garbage_and_access_tokens(client: AsyncClient, db_session):
+    data = await _login(client, db_session, "refresh_types@example.com")
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": "not-a-token"})
+    assert response.status_code == 401
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": data["access_token"]})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(client: AsyncClient, db_session):
+    data = await _login(client, db_session, "refresh_bearer@example.com")
+    with pytest.raises(AuthenticationError):
+        await client.get(
+            "/api/v1/auth/me", headers={"Authorization": f"Bearer {data['refresh_token']}"}
+        )
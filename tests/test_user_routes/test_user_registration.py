@@ -1,5 +1,8 @@
 import pytest
 from httpx import AsyncClient
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import event
+from app.services import auth_service
 
 
 @pytest.mark.asyncio
@@ -40,6 +43,24 @@ async def test_create_user_with_existing_email(client: AsyncClient):
     assert second_response.status_code == 409
 
 
+@pytest.mark.asyncio
+async def test_duplicate_registration_skips_password_hash(client: AsyncClient):
+    """Test a taken email is rejected before any Argon2 work"""
+    user_data = {
+        "email": "hash-once@example.com",
+        "full_name": "Hash Once",
+        "password": "StrongPassword123!",
+        "confirm_password": "StrongPassword123!",
+    }
+    assert (await client.post("/api/v1/auth/register", json=user_data)).status_code == 201
+
+    user_data["email"] = "Hash-Once@Example.com"
+    with patch.object(auth_service, "hash_password_async", AsyncMock()) as hasher:
+        response = await client.post("/api/v1/auth/register", json=user_data)
+    assert response.status_code == 409
+    hasher.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_create_user_with_invalid_email(client: AsyncClient):
     """create user with invalid email should fail"""
@@ -80,3 +101,34 @@ async def test_create_user_with_numeric_password(client: AsyncClient):
     response = await client.post("/api/v1/auth/register", json=user_data)
     assert response.status_code != 201
     assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_registration_checks_email_then_writes_user_in_one_statement(
+    client: AsyncClient, db_session
+):
+    """Test registration issues one email lookup, one INSERT and no refresh"""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0:3])
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={
+                "email": "one-statement@example.com",
+                "full_name": "One Statement",
+                "password": "StrongPassword123!",
+                "confirm_password": "StrongPassword123!",
+            },
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 201
+    assert response.json()["data"]["created_at"] is not None
+    user_statements = [s for s in statements if "users" in " ".join(s)]
+    assert [s[0] for s in user_statements] == ["SELECT", "INSERT"]
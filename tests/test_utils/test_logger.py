@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""Test the queue-based JSON logging pipeline"""
+
+import io
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueListener
+from app.utils.logger import (
+    CorrelationIdFilter,
+    DrainingQueueListener,
+    DroppingQueueHandler,
+    JsonFormatter,
+    SamplingFilter,
+    set_correlation_id,
+    clear_correlation_id,
+)
+
+
+def _pipeline(name: str, maxsize: int = 100):
+    """Logger wired to an in-memory stream through a queue listener"""
+    stream = io.StringIO()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=maxsize))
+    handler.addFilter(CorrelationIdFilter())
+
+    test_logger = logging.getLogger(name)
+    test_logger.handlers = [handler]
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.propagate = False
+    return test_logger, handler, stream_handler, stream
+
+
+def test_messages_with_quotes_are_valid_json():
+    """Test escaping, extras and correlation IDs in the output"""
+    test_logger, handler, stream_handler, stream = _pipeline("test.json")
+    listener = QueueListener(handler.queue, stream_handler)
+    listener.start()
+
+    set_correlation_id("req-123")
+    try:
+        test_logger.info('Login for "%s"', 'o"brien@example.com', extra={"user_id": 7})
+    finally:
+        clear_correlation_id()
+        listener.stop()
+
+    record = json.loads(stream.getvalue())
+    assert record["message"] == 'Login for "o"brien@example.com"'
+    assert record["correlation_id"] == "req-123"
+    assert record["user_id"] == 7
+    assert record["level"] == "INFO"
+
+
+def test_exceptions_are_captured_before_queueing():
+    """Test that tracebacks survive the hop to the listener thread"""
+    test_logger, handler, stream_handler, stream = _pipeline("test.exc")
+    listener = QueueListener(handler.queue, stream_handler)
+    listener.start()
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            test_logger.exception("Failed")
+    finally:
+        listener.stop()
+
+    record = json.loads(stream.getvalue())
+    assert "ValueError: boom" in record["exception"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test the drop policy when the listener falls behind"""
+    test_logger, handler, _, _ = _pipeline("test.drop", maxsize=2)
+
+    for i in range(5):
+        test_logger.info("message %d", i)
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_sampling_filter_applies_per_level():
+    """Test that only configured levels are sampled"""
+    sampler = SamplingFilter({"DEBUG": 0.0})
+    debug = logging.LogRecord("t", logging.DEBUG, "", 0, "debug", None, None)
+    error = logging.LogRecord("t", logging.ERROR, "", 0, "error", None, None)
+
+    assert sampler.filter(debug) is False
+    assert sampler.filter(error) is True
+    assert sampler.sampled_out == 1
+
+
+class BlockingHandler(logging.Handler):
+    """Holds the listener thread on its first record until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.unblock = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.entered.set()
+        self.unblock.wait()
+        self.records.append(record.getMessage())
+
+
+def _full_queue_listener(monkeypatch, timeout: float):
+    monkeypatch.setattr(DrainingQueueListener, "SENTINEL_TIMEOUT_SECONDS", timeout)
+    test_logger, handler, _, _ = _pipeline("test.draining", maxsize=2)
+    blocking = BlockingHandler()
+    listener = DrainingQueueListener(handler.queue, blocking)
+    listener.start()
+    test_logger.info("first")
+    assert blocking.entered.wait(1)
+    test_logger.info("second")
+    test_logger.info("third")
+    assert handler.queue.full()
+    return listener, blocking
+
+
+def test_stop_waits_for_room_in_a_full_queue(monkeypatch):
+    """Test stopping with a full queue drains it instead of raising queue.Full"""
+    listener, blocking = _full_queue_listener(monkeypatch, timeout=5)
+    threading.Timer(0.05, blocking.unblock.set).start()
+
+    listener.stop()
+    assert not listener.running
+    assert blocking.records == ["first", "second", "third"]
+
+
+def test_stop_leaves_a_stuck_listener_running(monkeypatch):
+    """Test a listener that can not drain is left running rather than raising"""
+    listener, blocking = _full_queue_listener(monkeypatch, timeout=0.05)
+
+    listener.stop()
+    assert listener.running
+
+    blocking.unblock.set()
+    listener.stop()
+    assert not listener.running
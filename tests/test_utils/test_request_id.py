@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""Test request ID propagation into responses, logs, tasks and SQL"""
+
+import logging
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.db.session import comment_with_request_id
+from app.middleware import request_id as request_id_module
+from app.middleware.request_id import RequestIdMiddleware
+from app.utils.logger import get_correlation_id, set_correlation_id, clear_correlation_id
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def request_log(monkeypatch):
+    """Records logged by the request ID middleware"""
+    handler = _ListHandler()
+    test_logger = logging.getLogger("test.request_id")
+    test_logger.handlers = [handler]
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.propagate = False
+    monkeypatch.setattr(request_id_module, "logger", test_logger)
+    return handler.records
+
+
+def _app(seen: list) -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(RequestIdMiddleware)
+
+    def remember():
+        seen.append(("task", get_correlation_id()))
+
+    @test_app.get("/items/{item_id}")
+    async def read_item(item_id: int, background_tasks: BackgroundTasks):
+        seen.append(("handler", get_correlation_id()))
+        background_tasks.add_task(remember)
+        return {"id": item_id}
+
+    return test_app
+
+
+async def _get(test_app: FastAPI, headers: dict | None = None):
+    async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as ac:
+        return await ac.get("/items/1", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_generated_and_propagated(request_log):
+    """Test a new ID reaches the handler, the background task and the response"""
+    seen = []
+    response = await _get(_app(seen))
+
+    request_id = response.headers["X-Request-ID"]
+    assert len(request_id) == 32
+    assert seen == [("handler", request_id), ("task", request_id)]
+    assert get_correlation_id() is None
+
+
+@pytest.mark.asyncio
+async def test_client_request_id_is_reused_when_well_formed(request_log):
+    """Test a valid incoming ID is kept and a malformed one replaced"""
+    seen = []
+    response = await _get(_app(seen), {"X-Request-ID": "edge-7f3a.1"})
+    assert response.headers["X-Request-ID"] == "edge-7f3a.1"
+
+    response = await _get(_app(seen), {"X-Request-ID": "bad */ id"})
+    assert response.headers["X-Request-ID"] != "bad */ id"
+
+
+@pytest.mark.asyncio
+async def test_final_log_line_has_duration(request_log, monkeypatch):
+    """Test one log line per request, a warning once it is slow"""
+    await _get(_app([]), {"X-Request-ID": "req-1"})
+
+    (record,) = request_log
+    assert record.levelno == logging.INFO
+    assert record.route == "/items/{item_id}"
+    assert record.status == 200
+    assert record.duration_ms >= 0
+    assert record.slow is False
+
+    monkeypatch.setattr(request_id_module.settings, "SLOW_REQUEST_MS", 0)
+    await _get(_app([]))
+    assert request_log[-1].levelno == logging.WARNING
+    assert request_log[-1].slow is True
+
+
+@pytest.mark.asyncio
+async def test_sql_is_commented_with_request_id(tmp_path):
+    """Test statements carry the active request ID"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'comments.db'}")
+    event.listen(
+        test_engine.sync_engine, "before_cursor_execute", comment_with_request_id, retval=True
+    )
+    executed = []
+    event.listen(
+        test_engine.sync_engine,
+        "after_cursor_execute",
+        lambda conn, cursor, statement, *args: executed.append(statement),
+    )
+    try:
+        async with test_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            set_correlation_id("req-42")
+            try:
+                await conn.execute(text("SELECT 2"))
+            finally:
+                clear_correlation_id()
+    finally:
+        await test_engine.dispose()
+
+    assert executed[-2] == "SELECT 1"
+    assert executed[-1] == "SELECT 2 /* request_id=req-42 */"
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Test the response envelope helpers"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from fastapi.responses import JSONResponse
+from app.schemas.user import UserRegistrationResponse
+from app.utils.responses import fail_response, success_response
+
+
+def _user_response() -> UserRegistrationResponse:
+    return UserRegistrationResponse(
+        id=str(uuid.uuid4()),
+        full_name="Zoë \"Quote\" O'Neil",
+        email="zoe@example.com",
+        email_verified=False,
+        is_active=True,
+        created_at=datetime(2025, 11, 16, 12, 0, tzinfo=timezone.utc),
+    )
+
+
+def test_success_response_matches_response_model_encoding():
+    """Test the envelope encodes models as FastAPI encodes response models"""
+    user = _user_response()
+    expected = JSONResponse(
+        status_code=201,
+        content={
+            "status": "success",
+            "status_code": 201,
+            "message": "Created",
+            "data": user.model_dump(mode="json"),
+        },
+    )
+
+    response = success_response(status_code=201, message="Created", data=user)
+
+    assert response.body == expected.body
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_envelope_encodes_uuid_and_datetime_values():
+    """Test native handling of UUID and datetime in error context"""
+    ident = uuid.uuid4()
+    when = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    response = fail_response(
+        status_code=400, message="Bad", context={"id": ident, "at": when}
+    )
+
+    body = json.loads(response.body)
+    assert body["error"] == {"id": str(ident), "at": "2025-01-01T00:00:00Z"}
+    assert body["status"] == "failure"